@@ -242,6 +242,44 @@ export const generateVideoFromArticle = async (scriptId) => {
   }
 };
 
+// Longest the client waits for a custom text video before giving up
+const VIDEO_JOB_TIMEOUT_MS = 600000; // 10 minutes
+
+// Each poll is held open by the server for up to this long (below axiosInstance's timeout)
+const VIDEO_JOB_WAIT_SECONDS = 25;
+
+// Poll /video_job/<jobId> until the job completes or fails
+const waitForVideoJob = async (jobId) => {
+  const deadline = Date.now() + VIDEO_JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const response = await axiosInstance.get(`/video_job/${jobId}`, {
+      params: { wait: VIDEO_JOB_WAIT_SECONDS },
+    });
+    const job = response.data;
+    if (!job?.success) {
+      return job;
+    }
+    if (job.data.status === "completed") {
+      return { success: true, data: job.data, error: null };
+    }
+    if (job.data.status === "failed") {
+      return {
+        success: false,
+        error: job.data.error || "Video generation failed",
+        data: null,
+      };
+    }
+    // Short pause so a server that answers without holding the poll isn't hammered
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+  }
+  return {
+    success: false,
+    error:
+      "The video is still being generated. Please check the Videos tab in a few minutes.",
+    data: null,
+  };
+};
+
 export const generateVideoFromCustomText = async (title, text) => {
   if (USE_MOCK_API) {
     // Mock response for testing without backend
@@ -275,7 +313,13 @@ export const generateVideoFromCustomText = async (title, text) => {
         text,
       }
     );
-    return response.data;
+    // The server renders in the background and answers 202 with a job_id;
+    // wait for the job so callers still get video_url/vertical_video_url
+    const jobId = response.data?.data?.job_id;
+    if (!response.data?.success || !jobId) {
+      return response.data;
+    }
+    return await waitForVideoJob(jobId);
   } catch (error) {
     console.error("Error generating video from custom text:", error);
     return {
@@ -1,5 +1,15 @@
+import os
+
 # Increase timeout to 10 minutes
 timeout = 600
-workers = 2
-threads = 2
-keepalive = 5 
\ No newline at end of file
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+# Requests mostly wait on news/OpenAI/Pexels APIs; video jobs run on their own pool,
+# so a thread per in-flight request is enough to keep the slow calls from queueing
+worker_class = "gthread"
+# A client waiting on /api/video_job/<id>?wait=N also holds a thread for up to 30 s
+# (MAX_VIDEO_JOB_WAIT in app.py), so keep this well above the number of open video pages
+threads = int(os.environ.get("GUNICORN_THREADS", 16))
+keepalive = 5
+# Import the app (pandas, OpenAI client, AutoVid) once in the master and fork workers
+# from it, so they share those pages and boot without re-importing everything
+preload_app = True
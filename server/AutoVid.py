@@ -1,5 +1,7 @@
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime, timedelta
 import os
@@ -13,6 +15,46 @@ import subprocess
 import math
 import random
 import inspect
+import functools
+import importlib.util
+import itertools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+# Background FFmpeg jobs (e.g. vertical conversions) so callers are not blocked on encoding
+_FFMPEG_POOL = ThreadPoolExecutor(max_workers=max(1, (os.cpu_count() or 2) // 2))
+
+# Per-process sequence appended to timestamped output names, so two videos started
+# within the same second (e.g. concurrent API requests) never share a file or folder
+_OUTPUT_SEQ = itertools.count(1)
+
+def _output_stamp():
+    """Timestamp plus sequence number for naming generated output"""
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{next(_OUTPUT_SEQ)}"
+
+# Sentence boundary used when splitting scripts into captions
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Direct MP4 links from Pexels, allowing a trailing query string
+_MP4_RE = re.compile(r'\.mp4(?:\?|$)', re.IGNORECASE)
+
+def _first_new_clip_url(videos, seen_urls, mp4_only=True):
+    """First search-result URL not in seen_urls (and an MP4 link unless mp4_only is False), or None"""
+    return next((v['url'] for v in videos
+                 if v.get('url') and v['url'] not in seen_urls
+                 and (not mp4_only or _MP4_RE.search(v['url']))), None)
+
+# Single-pass escaping of characters that are special inside drawtext text='...'
+_DRAWTEXT_ESCAPE = str.maketrans({
+    '\\': '\\\\',
+    "'": "\\'",
+    '"': '\\"',
+    ':': '\\:',
+    ',': '\\,',
+})
+
+# Letterbox a landscape video into a 720x1280 (9:16) frame
+_VERTICAL_PAD_FILTER = "scale=720:-2,pad=720:1280:(ow-iw)/2:(oh-ih)/2:black"
 
 # --- TTS Imports and Flags ---
 try:
@@ -40,13 +82,11 @@ except ImportError:
     print("Warning: gTTS not available. Google TTS will be unavailable.")
 # --- End TTS Imports ---
 
-# Try to import moviepy, but continue if it fails
-try:
-    from moviepy.editor import VideoFileClip, concatenate_videoclips, TextClip, CompositeVideoClip
-    MOVIEPY_AVAILABLE = True
-except ImportError:
+# MoviePy and Whisper are slow to import (Whisper pulls in torch), so only check that
+# they are installed here; they are imported where they are used
+MOVIEPY_AVAILABLE = importlib.util.find_spec("moviepy") is not None
+if not MOVIEPY_AVAILABLE:
     print("Warning: MoviePy not available. Video creation functionality will be disabled.")
-    MOVIEPY_AVAILABLE = False
 
 # Load environment variables from .env file
 load_dotenv()
@@ -67,12 +107,140 @@ except ImportError:
     print("gTTS not available. Will try other TTS options.")
 
 # --- Add this near the other import blocks ---
+WHISPER_AVAILABLE = importlib.util.find_spec("whisper") is not None
+if not WHISPER_AVAILABLE:
+    print("Warning: OpenAI Whisper not available. Subtitle generation will be disabled.")
+
 try:
-    import whisper
-    WHISPER_AVAILABLE = True
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
 except ImportError:
-    WHISPER_AVAILABLE = False
-    print("Warning: OpenAI Whisper not available. Subtitle generation will be disabled.")
+    PIL_AVAILABLE = False
+    print("Warning: Pillow not available. Captions will be rendered with the drawtext filter.")
+
+# Font files tried (in order) for caption rendering (Pillow images and drawtext)
+_CAPTION_FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/Windows/Fonts/arial.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+]
+
+def _build_drawtext_filter(text, fontfile=None, start=None, end=None, y="h-100", fontsize=24):
+    """
+    Build a boxed, horizontally centred drawtext filter for a caption
+
+    The text is escaped here, so callers pass it raw. When start/end are given
+    the caption is only enabled between those times.
+    """
+    filter_text = f"drawtext=text='{text.translate(_DRAWTEXT_ESCAPE)}':"
+    if fontfile:
+        # Forward slashes and an escaped drive colon keep Windows paths valid in the filter
+        fontfile = fontfile.replace("\\", "/").replace(":", "\\:")
+        filter_text += f"fontfile={fontfile}:"
+    filter_text += (
+        f"fontsize={fontsize}:"
+        f"fontcolor=white:box=1:boxcolor=black@0.7:boxborderw=5:"
+        f"x=(w-text_w)/2:y={y}"
+    )
+    if start is not None and end is not None:
+        filter_text += f":enable='between(t,{start},{end})'"
+    return filter_text
+
+@functools.lru_cache(maxsize=16)
+def _extract_kw_arity(cls):
+    """Number of parameters (without self) of cls.extract_keywords, cached per class"""
+    return len(inspect.signature(cls.extract_keywords).parameters) - 1
+
+@functools.lru_cache(maxsize=8)
+def _ffmpeg_capabilities(ffmpeg_path, kind):
+    """Output of `ffmpeg -<kind>` (e.g. encoders, filters), cached per binary"""
+    try:
+        result = subprocess.run([ffmpeg_path, "-hide_banner", f"-{kind}"], capture_output=True, text=True)
+        return result.stdout
+    except Exception as e:
+        print(f"Could not list FFmpeg {kind}: {e}")
+        return ""
+
+def _has_nvenc(ffmpeg_path):
+    """Whether this FFmpeg build provides the h264_nvenc encoder"""
+    return "h264_nvenc" in _ffmpeg_capabilities(ffmpeg_path, "encoders")
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst (no data written), copying when linking isn't possible"""
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem, or no hard-link support (e.g. FAT, some network shares)
+        shutil.copyfile(src, dst)
+
+def _segment_temp_dir(expected_bytes):
+    """
+    Temporary directory for intermediate video segments.
+    
+    Uses /dev/shm only when VIDEO_TEMP_IN_RAM is set and it has room for the segments:
+    Docker's default /dev/shm is 64 MB, so writing there unconditionally fails mid-render.
+    
+    Parameters:
+    - expected_bytes: Approximate total size of the files that will be written
+    
+    Returns:
+    - Path of a new temporary directory
+    """
+    if os.environ.get("VIDEO_TEMP_IN_RAM") and os.path.isdir("/dev/shm"):
+        try:
+            # Leave headroom: the segments are re-encoded and may come out larger than the source
+            if shutil.disk_usage("/dev/shm").free > 2 * expected_bytes:
+                return tempfile.mkdtemp(dir="/dev/shm")
+            print("Not enough room in /dev/shm for the caption segments, using the default temp directory")
+        except OSError as e:
+            print(f"Could not check /dev/shm: {e}")
+    return tempfile.mkdtemp()
+
+def _remove_extra_outputs(extra_outputs):
+    """Delete whatever a failed FFmpeg run left at its extra output paths, so no truncated file is used"""
+    for extra_path, _ in extra_outputs or ():
+        try:
+            os.remove(extra_path)
+        except OSError:
+            pass
+
+def _print_ffmpeg_stderr(error):
+    """Print the end of FFmpeg's stderr from a failed check=True run (nothing for other errors)"""
+    stderr = getattr(error, "stderr", None)
+    if stderr:
+        text = stderr.decode(errors="replace") if isinstance(stderr, bytes) else stderr
+        print(f"FFmpeg stderr: {text[-2000:]}")
+
+def _is_nonempty_file(path):
+    """True if path exists and has content (FFmpeg can leave an empty file behind on failure)"""
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+@functools.lru_cache(maxsize=8)
+def _load_caption_font(size):
+    """Load the first available caption font at the given size (cached per size)"""
+    for font_path in _CAPTION_FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+@functools.lru_cache(maxsize=1)
+def _api_session():
+    """Shared keep-alive session for the GNews and OpenAI APIs"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+    ))
+    return session
 
 class GNewsAPI:
     def __init__(self, api_key=None):
@@ -102,7 +270,7 @@ class GNewsAPI:
         
         try:
             print(f"Making request to {url} with API key: {self.api_key[:5]}...")
-            response = requests.get(url, params=params)
+            response = _api_session().get(url, params=params)
             
             if response.status_code != 200:
                 print(f"Error response: {response.status_code}")
@@ -152,7 +320,7 @@ class GNewsAPI:
         
         try:
             print(f"Making request to {url} with query: '{query}'...")
-            response = requests.get(url, params=params)
+            response = _api_session().get(url, params=params)
             
             if response.status_code != 200:
                 print(f"Error response: {response.status_code}")
@@ -191,6 +359,33 @@ class RSSNewsScraper:
             "NPR": "https://feeds.npr.org/1001/rss.xml"
         }
     
+    def fetch_feed(self, source, url, limit=5):
+        """
+        Fetch the newest entries of a single RSS feed
+        
+        Parameters:
+        - source: Display name of the feed
+        - url: Feed URL
+        - limit: Maximum number of entries to return
+        
+        Returns:
+        - List of article dictionaries
+        """
+        import feedparser
+        
+        print(f"Fetching RSS feed from {source}...")
+        feed = feedparser.parse(url)
+        return [
+            {
+                "title": entry.get("title", "No title"),
+                "source": source,
+                "published_at": entry.get("published", ""),
+                "url": entry.get("link", ""),
+                "description": entry.get("summary", "")
+            }
+            for entry in feed.entries[:limit]
+        ]
+    
     def get_top_headlines(self, limit=5):
         """
         Get top headlines from Romanian RSS feeds
@@ -200,21 +395,17 @@ class RSSNewsScraper:
             
             all_articles = []
             
-            for source, url in self.rss_feeds.items():
-                try:
-                    print(f"Fetching RSS feed from {source}...")
-                    feed = feedparser.parse(url)
-                    
-                    for entry in feed.entries[:limit]:
-                        all_articles.append({
-                            "title": entry.get("title", "No title"),
-                            "source": source,
-                            "published_at": entry.get("published", ""),
-                            "url": entry.get("link", ""),
-                            "description": entry.get("summary", "")
-                        })
-                except Exception as e:
-                    print(f"Error fetching RSS feed from {source}: {e}")
+            # Feeds are fetched concurrently, so a slow source only costs its own latency
+            with ThreadPoolExecutor(max_workers=len(self.rss_feeds)) as executor:
+                futures = {
+                    source: executor.submit(self.fetch_feed, source, url, limit)
+                    for source, url in self.rss_feeds.items()
+                }
+                for source, future in futures.items():
+                    try:
+                        all_articles.extend(future.result())
+                    except Exception as e:
+                        print(f"Error fetching RSS feed from {source}: {e}")
             
             # Convert to DataFrame and sort by published date
             df = pd.DataFrame(all_articles)
@@ -226,6 +417,20 @@ class RSSNewsScraper:
             print("feedparser module not found. Please install it with: pip install feedparser")
             return pd.DataFrame()
 
+def _print_articles(articles_df, show_source=True):
+    """Print a numbered headline list with description preview and URL"""
+    # to_dict('records') avoids building a pandas Series per row like iterrows does
+    for i, article in enumerate(articles_df.to_dict('records'), 1):
+        if show_source:
+            print(f"{i}. {article.get('title')} ({article.get('source')})")
+        else:
+            print(f"{i}. {article.get('title')}")
+        description = article.get('description')
+        if isinstance(description, str) and description:
+            print(f"   {description[:100]}...")
+        print(f"   URL: {article.get('url')}")
+        print()
+
 class NewsDatabase:
     def __init__(self, db_path="news_database.db"):
         self.db_path = db_path
@@ -253,6 +458,10 @@ class NewsDatabase:
             )
             ''')
             
+            # add_news_articles looks articles up by URL or title before inserting
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS ix_news_articles_url ON news_articles (url)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS ix_news_articles_title ON news_articles (title)")
+            
             # Create scripts table
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS scripts (
@@ -264,6 +473,15 @@ class NewsDatabase:
             )
             ''')
             
+            # Cache of Pexels search results, keyed on query|per_page|orientation
+            self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pexels_cache (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            ''')
+            
             # Create videos table
             self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS videos (
@@ -277,56 +495,92 @@ class NewsDatabase:
             )
             ''')
             
+            # Foreign keys used by the script/video joins
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_scripts_news_id ON scripts (news_id)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_script_id ON videos (script_id)")
+            
             self.conn.commit()
             print("Database initialized successfully")
             
         except sqlite3.Error as e:
             print(f"Database error: {e}")
     
+    def _find_article_ids(self, urls, titles):
+        """
+        Look up existing articles by URL and by title
+        
+        Returns:
+        - Two dictionaries: url -> id and title -> id
+        """
+        by_url, by_title = {}, {}
+        urls, titles = list(set(urls)), list(set(titles))
+        # Stay under SQLite's bound-parameter limit
+        chunk = 400
+        for i in range(0, max(len(urls), len(titles)), chunk):
+            url_chunk, title_chunk = urls[i:i + chunk], titles[i:i + chunk]
+            self.cursor.execute(
+                f"""
+                SELECT id, url, title FROM news_articles
+                WHERE url IN ({",".join("?" * len(url_chunk)) or "NULL"})
+                OR title IN ({",".join("?" * len(title_chunk)) or "NULL"})
+                ORDER BY id
+                """,
+                (*url_chunk, *title_chunk)
+            )
+            for article_id, url, title in self.cursor.fetchall():
+                by_url.setdefault(url, article_id)
+                by_title.setdefault(title, article_id)
+        return by_url, by_title
+    
     def add_news_articles(self, articles_df):
         """Add news articles to the database"""
         if articles_df.empty:
             print("No articles to add to database")
             return []
         
-        added_ids = []
+        rows = [
+            (
+                article.get('title', 'No title'),
+                article.get('description', ''),
+                article.get('source', 'Unknown'),
+                article.get('url', ''),
+                article.get('published_at', '')
+            )
+            for article in articles_df.to_dict('records')
+        ]
+        urls = [row[3] for row in rows]
+        titles = [row[0] for row in rows]
         
         try:
-            for _, article in articles_df.iterrows():
-                # Check if article already exists (by URL or title)
-                self.cursor.execute(
-                    "SELECT id FROM news_articles WHERE url = ? OR title = ?", 
-                    (article.get('url', ''), article.get('title', ''))
-                )
-                existing = self.cursor.fetchone()
-                
-                if existing:
-                    print(f"Article already exists in database: {article.get('title', 'No title')}")
-                    added_ids.append(existing[0])
+            # Check which articles already exist (by URL or title) with one query
+            by_url, by_title = self._find_article_ids(urls, titles)
+            
+            new_rows = []
+            seen_urls, seen_titles = set(by_url), set(by_title)
+            for row in rows:
+                title, url = row[0], row[3]
+                if url in seen_urls or title in seen_titles:
+                    if url in by_url or title in by_title:
+                        print(f"Article already exists in database: {title}")
                     continue
-                
-                # Insert new article
-                self.cursor.execute(
+                new_rows.append(row)
+                seen_urls.add(url)
+                seen_titles.add(title)
+            
+            # Insert all new articles in a single transaction
+            with self.conn:
+                self.cursor.executemany(
                     "INSERT INTO news_articles (title, description, source, url, published_at) VALUES (?, ?, ?, ?, ?)",
-                    (
-                        article.get('title', 'No title'),
-                        article.get('description', ''),
-                        article.get('source', 'Unknown'),
-                        article.get('url', ''),
-                        article.get('published_at', '')
-                    )
+                    new_rows
                 )
-                
-                article_id = self.cursor.lastrowid
-                added_ids.append(article_id)
-                print(f"Added article to database: {article.get('title', 'No title')}")
+            for row in new_rows:
+                print(f"Added article to database: {row[0]}")
             
-            self.conn.commit()
-            return added_ids
+            by_url, by_title = self._find_article_ids(urls, titles)
+            return [by_url.get(url) or by_title.get(title) for url, title in zip(urls, titles)]
             
         except sqlite3.Error as e:
             print(f"Error adding articles to database: {e}")
-            self.conn.rollback()
             return []
     
     def get_unused_articles(self, limit=5):
@@ -408,6 +662,38 @@ class NewsDatabase:
             print(f"Error adding video to database: {e}")
             return None
     
+    def add_custom_text_video(self, title, script_text, video_path, keywords):
+        """
+        Record a video made from custom text, together with its article and script rows
+        
+        All three rows are written in one transaction so a failure leaves nothing behind.
+        
+        Returns:
+        - The new video ID, or None if failed
+        """
+        try:
+            keywords_str = ','.join(keywords) if isinstance(keywords, list) else keywords
+            
+            with self.conn:
+                self.cursor.execute(
+                    "INSERT INTO news_articles (title, source, used_for_script) VALUES (?, ?, 1)",
+                    (title, "Custom text")
+                )
+                article_id = self.cursor.lastrowid
+                self.cursor.execute(
+                    "INSERT INTO scripts (news_id, script_text) VALUES (?, ?)",
+                    (article_id, script_text)
+                )
+                script_id = self.cursor.lastrowid
+                self.cursor.execute(
+                    "INSERT INTO videos (script_id, video_path, keywords) VALUES (?, ?, ?)",
+                    (script_id, video_path, keywords_str)
+                )
+            return self.cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"Error adding custom text video to database: {e}")
+            return None
+    
     def get_scripts_without_videos(self, limit=5):
         """Get scripts that don't have associated videos yet"""
         try:
@@ -448,6 +734,30 @@ class NewsDatabase:
             print(f"Error fetching recent videos: {e}")
             return []
     
+    def get_pexels_cache(self, key, max_age):
+        """Return cached Pexels results younger than max_age seconds, or None"""
+        try:
+            self.cursor.execute(
+                "SELECT payload FROM pexels_cache WHERE key = ? AND fetched_at > ?",
+                (key, time.time() - max_age)
+            )
+            row = self.cursor.fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            print(f"Error reading Pexels cache: {e}")
+            return None
+    
+    def set_pexels_cache(self, key, videos):
+        """Store Pexels results for a search key"""
+        try:
+            with self.conn:
+                self.cursor.execute(
+                    "INSERT OR REPLACE INTO pexels_cache (key, payload, fetched_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(videos), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing Pexels cache: {e}")
+    
     def close(self):
         """Close the database connection"""
         if self.conn:
@@ -462,6 +772,8 @@ class ScriptGenerator:
             raise ValueError("OpenAI API key is required for script generation")
         
         openai.api_key = self.api_key
+        # Reuse pooled connections for the completion calls instead of a new TLS handshake each
+        openai.requestssession = _api_session()
     
     def generate_script(self, article_title, article_text=None, max_words=90):
         """
@@ -538,7 +850,7 @@ Format: Plain text script only.
                 print(f"Script is too long ({word_count} words). Truncating to approximately {max_words} words...")
                 
                 # Try to truncate at a sentence boundary
-                sentences = re.split(r'(?<=[.!?])\s+', script)
+                sentences = _SENTENCE_RE.split(script)
                 truncated_script = ""
                 current_word_count = 0
                 
@@ -577,6 +889,10 @@ Format: Plain text script only.
             return None
 
 class KeywordExtractor:
+    # Keywords already extracted in this process, keyed on (title, description, max_keywords).
+    # Shared between instances so the CLI's extractor and VideoCreator's reuse each other's results.
+    _keyword_cache = {}
+    
     def __init__(self, api_key=None):
         # Get API key from environment variable
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
@@ -584,9 +900,14 @@ class KeywordExtractor:
             raise ValueError("OpenAI API key is required for keyword extraction")
         
         openai.api_key = self.api_key
+        openai.requestssession = _api_session()
     
     def extract_keywords(self, title, description, max_keywords=5):
         """Extract relevant keywords from news title and description"""
+        cache_key = (title, description, max_keywords)
+        if cache_key in self._keyword_cache:
+            return list(self._keyword_cache[cache_key])
+        
         try:
             prompt = f"""
             Extract {max_keywords} keywords from this news article that would be useful for finding relevant stock videos.
@@ -630,6 +951,8 @@ class KeywordExtractor:
                 if fallback not in keyword_list:
                     keyword_list.append(fallback)
             
+            # Only API results are cached so a transient error is retried next time
+            self._keyword_cache[cache_key] = tuple(keyword_list)
             return keyword_list
             
         except Exception as e:
@@ -686,13 +1009,32 @@ class KeywordExtractor:
         
         return enhanced_keywords[:8]  # Limit to 8 keywords
 
+@functools.lru_cache(maxsize=1)
+def _pexels_session():
+    """Shared requests session for the Pexels API and clip downloads (pool sized for 8 parallel requests)"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+    ))
+    return session
+
 class PexelsAPI:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, cache_db=None, cache_ttl=86400):
         # Use the provided API key or try to get from environment
         self.api_key = api_key or os.environ.get("PEXELS_API_KEY")
         if not self.api_key:
             raise ValueError("Pexels API key is required")
         self.base_url = "https://api.pexels.com/videos"
+        
+        # Optional NewsDatabase used to keep search results between runs
+        self.cache_db = cache_db
+        self.cache_ttl = cache_ttl
+        
+        # Process-wide keep-alive session, so TLS to Pexels is negotiated once even
+        # when the CLI and VideoCreator each hold their own PexelsAPI
+        self.session = _pexels_session()
 
     def search_videos(self, query, per_page=5, orientation="landscape"):
         """
@@ -706,6 +1048,34 @@ class PexelsAPI:
         Returns:
         - List of video information dictionaries
         """
+        cached = self._get_cached_search(query, per_page, orientation)
+        if cached is not None:
+            return cached
+        
+        videos = self._fetch_videos(query, per_page, orientation)
+        self._cache_search(query, per_page, orientation, videos)
+        return videos
+
+    def _cache_key(self, query, per_page, orientation):
+        return f"{query}|{per_page}|{orientation}"
+
+    def _get_cached_search(self, query, per_page, orientation):
+        """Cached results for a search, or None (must be called from the thread owning cache_db)"""
+        if self.cache_db is None:
+            return None
+        videos = self.cache_db.get_pexels_cache(self._cache_key(query, per_page, orientation), self.cache_ttl)
+        if videos is not None:
+            print(f"Using cached Pexels results for '{query}'")
+        return videos
+
+    def _cache_search(self, query, per_page, orientation, videos):
+        """Store search results (must be called from the thread owning cache_db)"""
+        # Empty results are usually a network or quota error, so they are not kept
+        if self.cache_db is not None and videos:
+            self.cache_db.set_pexels_cache(self._cache_key(query, per_page, orientation), videos)
+
+    def _fetch_videos(self, query, per_page=5, orientation="landscape"):
+        """Run a search against the Pexels API, bypassing the cache"""
         url = f"{self.base_url}/search"
         
         params = {
@@ -717,7 +1087,7 @@ class PexelsAPI:
         
         try:
             print(f"Searching Pexels for videos with query: '{query}'...")
-            response = requests.get(url, params=params, headers={"Authorization": self.api_key})
+            response = self.session.get(url, params=params, headers={"Authorization": self.api_key})
             
             if response.status_code != 200:
                 print(f"Error response: {response.status_code}")
@@ -763,6 +1133,52 @@ class PexelsAPI:
             print(f"Network error: {e}")
             return []
 
+    def search_videos_many(self, queries, per_page=5, orientation="landscape"):
+        """
+        Run several searches concurrently
+        
+        Parameters:
+        - queries: List of search terms
+        - per_page: Number of results per query
+        - orientation: landscape, portrait, or square
+        
+        Returns:
+        - Dictionary mapping each query to its list of video information dictionaries
+        """
+        results = {}
+        # The cache is read and written here; only network requests go to the worker threads,
+        # since the SQLite connection can't be shared with them
+        misses = []
+        for query in dict.fromkeys(queries):
+            cached = self._get_cached_search(query, per_page, orientation)
+            if cached is not None:
+                results[query] = cached
+            else:
+                misses.append(query)
+        if not misses:
+            return results
+        if len(misses) == 1:
+            # Nothing to overlap with, so skip the pool and search on this thread
+            query = misses[0]
+            results[query] = self._fetch_videos(query, per_page, orientation)
+            self._cache_search(query, per_page, orientation, results[query])
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(8, len(misses))) as executor:
+            futures = {
+                executor.submit(self._fetch_videos, query, per_page, orientation): query
+                for query in misses
+            }
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    results[query] = future.result()
+                except Exception as e:
+                    print(f"Error searching Pexels for '{query}': {e}")
+                    results[query] = []
+                self._cache_search(query, per_page, orientation, results[query])
+        return results
+
 class VideoCreator:
     def __init__(self, output_dir=None, ffmpeg_path=None):
         # If ffmpeg_path is provided, use it directly
@@ -782,9 +1198,29 @@ class VideoCreator:
                 print(f"Using FFmpeg at: {self.ffmpeg_path}")
                 self.has_ffmpeg = True
         
+        # Resolve ffprobe once, preferring the binary next to FFmpeg
+        ffmpeg_dir = os.path.dirname(self.ffmpeg_path) if self.ffmpeg_path else ""
+        search_path = os.pathsep.join(p for p in (ffmpeg_dir, os.environ.get("PATH", "")) if p)
+        self.ffprobe_path = shutil.which("ffprobe", path=search_path) or os.path.join(ffmpeg_dir, "ffprobe")
+        
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # Hardware decode method for overlay passes ("" when unavailable), probed lazily
+        self._hwaccel = None
+        
+        # API clients used by create_video_from_text, built on first use and then reused
+        # so a long-lived creator (the web app keeps one) doesn't rebuild them per video
+        self._script_generator = None
+        self._keyword_extractor = None
+        self._pexels_api = None
+        
+        # Font file for drawtext captions (None lets FFmpeg fall back to fontconfig)
+        self.caption_font = self._find_caption_font()
+        
+        # FFmpeg console output is discarded unless we need stderr for error reporting
+        self._error_stdio = dict(stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        
         # --- Load ElevenLabs API Key ---
         self.elevenlabs_api_key = os.environ.get("ELEVENLABS_API_KEY")
         if ELEVENLABS_AVAILABLE and self.elevenlabs_api_key:
@@ -818,13 +1254,53 @@ class VideoCreator:
         
         for path in common_paths:
             print(f"Checking for FFmpeg at: {path}")
-            if self._is_valid_ffmpeg(path):
-                return path
+            # Resolve to an absolute path so later lookups never depend on PATH
+            resolved_path = shutil.which(path)
+            if resolved_path:
+                return resolved_path
         
         print("FFmpeg not found in common locations.")
         # Instead of interactive prompt, just return None
         return None
     
+    def _hwaccel_args(self):
+        """FFmpeg input options for hardware-accelerated decoding (probed once)"""
+        if self._hwaccel is None:
+            self._hwaccel = ""
+            try:
+                result = subprocess.run(
+                    [self.ffmpeg_path, "-hide_banner", "-hwaccels"],
+                    capture_output=True, text=True, check=True
+                )
+                # First line is the "Hardware acceleration methods:" header
+                methods = [line.strip() for line in result.stdout.splitlines()[1:] if line.strip()]
+                if methods:
+                    # "auto" picks a working method per input and falls back to software decode
+                    self._hwaccel = "auto"
+                    print(f"Hardware decoding available: {', '.join(methods)}")
+            except Exception as e:
+                print(f"Could not probe FFmpeg hardware acceleration: {e}")
+        
+        return ["-hwaccel", self._hwaccel] if self._hwaccel else []
+    
+    def _find_caption_font(self):
+        """Find a font file for drawtext captions on this platform."""
+        for font_path in _CAPTION_FONT_PATHS:
+            if os.path.exists(font_path):
+                return font_path
+        
+        # Ask fontconfig for its default sans font on Linux/macOS
+        if shutil.which("fc-match"):
+            try:
+                result = subprocess.run(["fc-match", "-f", "%{file}", "sans"], capture_output=True, text=True)
+                if result.returncode == 0 and os.path.exists(result.stdout.strip()):
+                    return result.stdout.strip()
+            except Exception as e:
+                print(f"Error running fc-match: {e}")
+        
+        print("No caption font file found, drawtext will use its default font")
+        return None
+    
     def download_video(self, url, output_path):
         """
         Download a video from a URL to a local file.
@@ -843,14 +1319,15 @@ class VideoCreator:
                 
             print(f"Downloading video from {url}...")
             
-            # Using requests to download the file
-            response = requests.get(url, stream=True)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # The clips are fetched in parallel from the same CDN hosts, so reuse the
+            # pooled keep-alive session instead of a fresh connection per file
+            with _pexels_session().get(url, stream=True, timeout=(10, 120)) as response:
+                response.raise_for_status()  # Raise an exception for HTTP errors
+                
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        if chunk:
+                            f.write(chunk)
             
             # Verify the file was downloaded successfully
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
@@ -886,8 +1363,7 @@ class VideoCreator:
         
         if not output_filename:
             # Generate a filename based on timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"news_video_{timestamp}.mp4"
+            output_filename = f"news_video_{_output_stamp()}.mp4"
         
         output_path = os.path.join(self.output_dir, output_filename)
         
@@ -926,7 +1402,7 @@ class VideoCreator:
             
             try:
                 # Run with minimal output
-                subprocess.run(simple_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, check=True)
+                subprocess.run(simple_cmd, **self._error_stdio, shell=True, check=True)
                 print(f"✓ Successfully created simple video: {output_path}")
                 return output_path
             except subprocess.CalledProcessError as e:
@@ -955,13 +1431,15 @@ class VideoCreator:
             except Exception as e:
                 print(f"Error cleaning up temporary directory: {e}")
 
-    def create_video_with_narration(self, script_text, video_sources):
+    def create_video_with_narration(self, script_text, video_sources, extra_outputs=None):
         """
         Create a video with narration and subtitles from multiple video files
         
         Parameters:
         - script_text: The text script for narration
         - video_sources: List of video sources, either URLs as strings or dictionaries with 'url' key
+        - extra_outputs: Optional list of (output_path, filter_suffix) tuples rendered in the
+                         same pass as the subtitle burn (e.g. a vertical version)
         
         Returns:
         - Path to the created video
@@ -975,8 +1453,7 @@ class VideoCreator:
             return None
         
         # Generate a unique filename based on timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"news_video_{timestamp}.mp4"
+        output_filename = f"news_video_{_output_stamp()}.mp4"
         output_path = os.path.join(self.output_dir, output_filename)
         
         # Create a temporary directory for processing
@@ -998,7 +1475,7 @@ class VideoCreator:
             
             # 2. Download Videos
             print(f"Downloading {len(video_sources)} videos...")
-            downloaded_video_paths = []
+            download_jobs = []
             for i, video_source in enumerate(video_sources):
                 # Extract URL from dictionary if needed
                 if isinstance(video_source, dict) and 'url' in video_source:
@@ -1006,9 +1483,12 @@ class VideoCreator:
                 else:
                     video_url = video_source  # Assume it's already a URL string
                     
-                video_path = os.path.join(temp_dir, f"download_{i}.mp4")
-                if self.download_video(video_url, video_path):
-                    downloaded_video_paths.append(video_path)
+                download_jobs.append((video_url, os.path.join(temp_dir, f"download_{i}.mp4")))
+            
+            # Download all clips at once; the wait is the slowest clip instead of the sum
+            with ThreadPoolExecutor(max_workers=min(8, len(download_jobs))) as executor:
+                download_ok = list(executor.map(lambda job: self.download_video(*job), download_jobs))
+            downloaded_video_paths = [path for (_, path), ok in zip(download_jobs, download_ok) if ok]
             
             if not downloaded_video_paths:
                 print("Failed to download any videos. Cannot create video.")
@@ -1043,38 +1523,20 @@ class VideoCreator:
                 print("No videos were successfully processed. Cannot create video.")
                 return None
             
-            # Concatenate processed videos
-            print("Concatenating videos...")
-            concat_file_path = os.path.join(temp_dir, "concat_list.txt")
-            with open(concat_file_path, 'w') as f:
-                for video in processed_videos:
-                    f.write(f"file '{video}'\n")
-            
-            # Using FFmpeg to concatenate
-            concat_output = os.path.join(temp_dir, "concatenated.mp4")
-            concat_cmd = [
-                self.ffmpeg_path,
-                "-f", "concat",
-                "-safe", "0",
-                "-i", concat_file_path,
-                "-c", "copy",
-                "-y", concat_output
-            ]
+            # Concatenate processed videos and mux the narration in one pass, so the
+            # joined footage never has to be written out and read back as an intermediate
+            print("Concatenating videos and adding narration...")
+            concat_text = "".join(f"file '{os.path.abspath(video)}'\n" for video in processed_videos)
             
-            try:
-                subprocess.run(concat_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                print("✓ Videos concatenated successfully")
-            except subprocess.CalledProcessError as e:
-                print(f"Error concatenating videos: {e}")
-                return None
-            
-            # Add narration using FFmpeg
-            print("Adding narration to video...")
             try:
                 # Normalize audio levels and add to video
                 final_cmd = [
                     self.ffmpeg_path,
-                    "-i", concat_output,
+                    "-loglevel", "error", "-nostats",
+                    "-f", "concat",
+                    "-safe", "0",
+                    "-protocol_whitelist", "file,pipe",
+                    "-i", "pipe:0",
                     "-i", audio_path,
                     "-c:v", "copy",
                     "-c:a", "aac",
@@ -1084,7 +1546,7 @@ class VideoCreator:
                     "-y", output_path
                 ]
                 
-                subprocess.run(final_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                subprocess.run(final_cmd, input=concat_text.encode('utf-8'), check=True, **self._error_stdio)
                 print(f"✓ Successfully created video with narration: {output_path}")
                 
                 # After the narration file is created and before video processing:
@@ -1109,7 +1571,7 @@ class VideoCreator:
                 if subtitle_path and os.path.exists(subtitle_path):
                     print("Attempting to add subtitles using traditional FFmpeg filters...")
                     subtitled_output_path = output_path.replace(".mp4", "_subtitled.mp4")
-                    result = self.burn_subtitles(output_path, subtitle_path, subtitled_output_path)
+                    result = self.burn_subtitles(output_path, subtitle_path, subtitled_output_path, extra_outputs)
                     
                     if result and result != output_path:  # Check if a new file was created
                         final_output_path = subtitled_output_path
@@ -1129,7 +1591,7 @@ class VideoCreator:
                             
                             # Fall back to the simple caption overlay as the last resort
                             caption_output_path = output_path.replace(".mp4", "_caption.mp4")
-                            caption_result = self.create_caption_overlay(output_path, script_text, caption_output_path)
+                            caption_result = self.create_caption_overlay(output_path, script_text, caption_output_path, extra_outputs)
                             
                             if caption_result and os.path.exists(caption_result):
                                 final_output_path = caption_result
@@ -1322,7 +1784,7 @@ class VideoCreator:
         try:
             # Use FFprobe instead of FFmpeg for getting duration
             duration_cmd = [
-                self.ffmpeg_path.replace("ffmpeg", "ffprobe"),  # Use ffprobe instead
+                self.ffprobe_path,  # Use ffprobe instead
                 "-v", "quiet",
                 "-print_format", "json",
                 "-show_format",
@@ -1397,10 +1859,18 @@ class VideoCreator:
         Parameters:
         - script: The script text to use for the video
         - videos: List of video information dictionaries from Pexels API
-        - output_filename: Name for the output file (optional)
+        - output_filename: Name for the output file in output_dir (optional)
+        
+        Returns:
+        - Path to the created video or None if failed
         """
         # Use our new method that matches video length to narration
-        return self.create_video_with_narration(script, videos, output_filename)
+        video_path = self.create_video_with_narration(script, videos)
+        if video_path and output_filename:
+            named_path = os.path.join(self.output_dir, os.path.basename(output_filename))
+            os.replace(video_path, named_path)
+            return named_path
+        return video_path
 
     def add_captions_to_video(self, video_path, script_text, output_path=None):
         """
@@ -1474,11 +1944,8 @@ class VideoCreator:
             if current_line:
                 lines.append(' '.join(current_line))
             
-            # Join lines with newlines
-            formatted_text = '\\n'.join(lines)
-            
-            # Escape special characters
-            formatted_text = formatted_text.replace("'", "\\'").replace(":", "\\:").replace(",", "\\,").replace("\\", "\\\\")
+            # Escape special characters, then join lines with newlines
+            formatted_text = '\\n'.join(line.translate(_DRAWTEXT_ESCAPE) for line in lines)
             
             # Create a command with a simple text overlay
             caption_cmd = [
@@ -1499,12 +1966,13 @@ class VideoCreator:
             print(f"Adding caption to video...")
             
             # Run with minimal output
-            subprocess.run(caption_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, check=True)
+            subprocess.run(caption_cmd, **self._error_stdio, shell=True, check=True)
             print(f"✓ Successfully added caption to video: {output_path}")
             return output_path
         
         except Exception as e:
             print(f"Error adding captions: {e}")
+            _print_ffmpeg_stderr(e)
             import traceback
             traceback.print_exc()
             
@@ -1536,11 +2004,11 @@ class VideoCreator:
             temp_dir = tempfile.mkdtemp()
             
             # Get the first sentence or up to 50 characters
-            first_sentence = re.split(r'(?<=[.!?])\s+', script_text)[0]
+            first_sentence = _SENTENCE_RE.split(script_text)[0]
             short_text = first_sentence[:50] + "..." if len(first_sentence) > 50 else first_sentence
             
             # Escape special characters
-            short_text = short_text.replace("'", "\\'").replace(":", "\\:").replace(",", "\\,").replace("\\", "\\\\")
+            short_text = short_text.translate(_DRAWTEXT_ESCAPE)
             
             # Create a simple drawtext filter with better styling
             text_cmd = [
@@ -1561,12 +2029,13 @@ class VideoCreator:
             print(f"Adding simple text overlay to video...")
             
             # Run with minimal output
-            subprocess.run(text_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, check=True)
+            subprocess.run(text_cmd, **self._error_stdio, shell=True, check=True)
             print(f"✓ Successfully added text overlay to video: {output_path}")
             return output_path
         
         except Exception as e:
             print(f"Error adding text overlay: {e}")
+            _print_ffmpeg_stderr(e)
             import traceback
             traceback.print_exc()
             return None
@@ -1604,6 +2073,7 @@ class VideoCreator:
         
         try:
             print("Loading Whisper model (this may take a moment)...")
+            import whisper
             # Use the "tiny" or "base" model for faster processing, or "small"/"medium" for better accuracy
             model = whisper.load_model("base")
             
@@ -1628,6 +2098,7 @@ class VideoCreator:
                 wav_path = audio_path.replace('.mp3', '.wav')
                 convert_cmd = [
                     self.ffmpeg_path,
+                    "-loglevel", "error", "-nostats",
                     "-i", audio_path,
                     "-ar", "16000",  # 16kHz sample rate (what Whisper expects)
                     "-ac", "1",      # mono
@@ -1636,7 +2107,7 @@ class VideoCreator:
                 ]
                 
                 try:
-                    subprocess.run(convert_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                    subprocess.run(convert_cmd, check=True, **self._error_stdio)
                     print(f"Converted audio to WAV format for Whisper: {wav_path}")
                     
                     # Now try transcribing the WAV file
@@ -1647,6 +2118,7 @@ class VideoCreator:
                         return None
                 except Exception as conv_e:
                     print(f"Error converting audio to WAV: {conv_e}")
+                    _print_ffmpeg_stderr(conv_e)
                     return None
             
             if not result or "segments" not in result:
@@ -1754,7 +2226,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         
         return f"{hours}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
 
-    def burn_subtitles(self, video_path, subtitle_path, output_path):
+    def burn_subtitles(self, video_path, subtitle_path, output_path, extra_outputs=None):
         """
         Burn subtitles onto a video using FFmpeg with improved path handling
         
@@ -1762,6 +2234,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         - video_path: Path to the input video
         - subtitle_path: Path to the ASS subtitle file
         - output_path: Path to save the output video with subtitles
+        - extra_outputs: Optional list of (output_path, filter_suffix) tuples encoded from
+                         the same subtitled frames in a single FFmpeg run
         
         Returns:
         - Path to the output video or None if failed
@@ -1782,27 +2256,19 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             subtitle_filter = f"subtitles='{subtitle_path_abs.replace(chr(92), '/')}'"
             
             # Alternative command using a more reliable subtitles filter
-            cmd = [
-                self.ffmpeg_path,
-                "-i", video_path_abs,
-                "-vf", subtitle_filter,
-                "-c:v", "libx264",
-                "-preset", "fast",
-                "-crf", "23",
-                "-c:a", "copy",
-                "-y", output_path_abs
-            ]
+            cmd = self._build_subtitle_cmd(video_path_abs, subtitle_filter, output_path_abs, extra_outputs)
             
             print(f"Running FFmpeg command: {' '.join(cmd)}")
             
             # Execute the command
-            result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run(cmd, check=True, **self._error_stdio)
             
             if os.path.exists(output_path):
                 print(f"✓ Video with subtitles created successfully: {output_path}")
                 return output_path
             else:
                 print("Failed to create video with subtitles")
+                _remove_extra_outputs(extra_outputs)
                 return None
         
         except subprocess.CalledProcessError as e:
@@ -1820,19 +2286,11 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 
                 if os.path.exists(srt_path):
                     # Use a more basic subtitle filter
-                    cmd = [
-                        self.ffmpeg_path,
-                        "-i", video_path_abs,
-                        "-vf", f"subtitles='{os.path.abspath(srt_path).replace(chr(92), '/')}'",
-                        "-c:v", "libx264",
-                        "-preset", "fast", 
-                        "-crf", "23",
-                        "-c:a", "copy",
-                        "-y", output_path_abs
-                    ]
+                    srt_filter = f"subtitles='{os.path.abspath(srt_path).replace(chr(92), '/')}'"
+                    cmd = self._build_subtitle_cmd(video_path_abs, srt_filter, output_path_abs, extra_outputs)
                     
                     print(f"Running alternative FFmpeg command: {' '.join(cmd)}")
-                    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                    subprocess.run(cmd, check=True, **self._error_stdio)
                     
                     if os.path.exists(output_path):
                         print(f"✓ Video with subtitles created successfully (alternative method): {output_path}")
@@ -1841,17 +2299,48 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 print("Alternative subtitle approach also failed")
             except Exception as alt_e:
                 print(f"Alternative subtitle method failed: {alt_e}")
+                _print_ffmpeg_stderr(alt_e)
             
             # Return the original video if subtitle burning fails
             print("Returning original video without subtitles")
+            _remove_extra_outputs(extra_outputs)
             return video_path
         
         except Exception as e:
             print(f"Error burning subtitles: {e}")
+            _print_ffmpeg_stderr(e)
             # Return the original video if subtitle burning fails
             print("Returning original video without subtitles")
+            _remove_extra_outputs(extra_outputs)
             return video_path
 
+    def _build_subtitle_cmd(self, video_path, subtitle_filter, output_path, extra_outputs=None):
+        """
+        Build the FFmpeg command that burns subtitles (or any other caption filter),
+        optionally writing extra outputs
+
+        Extra outputs share the decode and subtitle render: the subtitled stream is
+        split and each branch gets its own filter suffix and encoder.
+        """
+        encode_args = ["-c:v", "libx264", "-preset", "fast", "-crf", "23", "-c:a", "copy"]
+
+        if not extra_outputs:
+            return [self.ffmpeg_path, "-loglevel", "error", "-nostats",
+                    *self._hwaccel_args(), "-i", video_path, "-vf", subtitle_filter] + encode_args + ["-y", output_path]
+
+        branch_count = len(extra_outputs) + 1
+        split_labels = "".join(f"[s{i}]" for i in range(branch_count))
+        filter_graph = f"[0:v]{subtitle_filter},split={branch_count}{split_labels}"
+        for i, (_, filter_suffix) in enumerate(extra_outputs, 1):
+            filter_graph += f";[s{i}]{filter_suffix}[out{i}]"
+
+        cmd = [self.ffmpeg_path, "-loglevel", "error", "-nostats", "-y",
+               *self._hwaccel_args(), "-i", video_path, "-filter_complex", filter_graph,
+               "-map", "[s0]", "-map", "0:a?"] + encode_args + [output_path]
+        for i, (extra_path, _) in enumerate(extra_outputs, 1):
+            cmd += ["-map", f"[out{i}]", "-map", "0:a?"] + encode_args + [os.path.abspath(extra_path)]
+        return cmd
+
     def _convert_ass_to_srt(self, ass_path, srt_path):
         """
         Convert ASS subtitle file to SRT format using our segments
@@ -1922,6 +2411,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             # FFmpeg command to scale, set duration (padding if needed), remove audio
             process_cmd = [
                 self.ffmpeg_path,
+                "-loglevel", "error", "-nostats",
                 "-i", input_path,
                 "-vf", f"scale=1280:720:force_original_aspect_ratio=decrease,pad=1280:720:(ow-iw)/2:(oh-ih)/2,fps=30,tpad=stop_mode=clone:stop_duration={target_duration+0.1}",  # Scale, pad, set fps, pad end
                 "-t", str(target_duration),  # Trim to exactly target_duration
@@ -1934,7 +2424,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             ]
             
             # Execute the command
-            subprocess.run(process_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run(process_cmd, check=True, **self._error_stdio)
             
             # Verify the file was created successfully
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
@@ -2003,6 +2493,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             # Use FFmpeg with the simpler subtitles filter
             cmd = [
                 self.ffmpeg_path,
+                "-loglevel", "error", "-nostats",
                 "-i", video_path,
                 "-vf", f"subtitles='{temp_sub_path.replace(chr(92), '/')}'",
                 "-c:v", "libx264",
@@ -2011,7 +2502,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 "-y", output_path
             ]
             
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run(cmd, check=True, **self._error_stdio)
             
             # Clean up temporary file
             if os.path.exists(temp_sub_path):
@@ -2023,6 +2514,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         
         except Exception as e:
             print(f"Error creating simple subtitled video: {e}")
+            _print_ffmpeg_stderr(e)
             return None
     
     def _format_srt_time(self, seconds):
@@ -2045,7 +2537,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 "-of", "csv=p=0",
             ]
             
-            result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            result = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
             duration = float(result.stdout.decode().strip())
             return duration
         except Exception as e:
@@ -2193,6 +2685,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             # Create the FFmpeg command
             cmd = [
                 self.ffmpeg_path,
+                "-loglevel", "error", "-nostats",
                 "-i", video_path,
                 "-vf", simple_filter,
                 "-c:v", "libx264",
@@ -2202,7 +2695,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             ]
             
             print(f"Running simplified subtitle command: {' '.join(cmd)}")
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run(cmd, check=True, **self._error_stdio)
             
             if os.path.exists(output_path):
                 print(f"✓ Video with basic text overlay created: {output_path}")
@@ -2213,17 +2706,19 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 
         except Exception as e:
             print(f"Error creating hardcoded subtitles: {e}")
+            _print_ffmpeg_stderr(e)
             import traceback
             traceback.print_exc()
             return None
 
     def _format_vtt_time(self, seconds):
         """Format seconds as WebVTT timestamp (HH:MM:SS.mmm)"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        msecs = int((seconds - int(seconds)) * 1000)
-        
+        # Work in whole milliseconds to avoid float drift in the fraction
+        msecs = int(round(seconds * 1000))
+        minutes, msecs = divmod(msecs, 60000)
+        hours, minutes = divmod(minutes, 60)
+        secs, msecs = divmod(msecs, 1000)
+
         return f"{hours:02d}:{minutes:02d}:{secs:02d}.{msecs:03d}"
 
     def create_subtitles_with_moviepy(self, video_path, script_text, output_path):
@@ -2326,7 +2821,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             try:
                 # Use ffprobe to get duration more reliably
                 cmd = [
-                    os.path.join(os.path.dirname(self.ffmpeg_path), "ffprobe"),
+                    self.ffprobe_path,
                     "-v", "error",
                     "-show_entries", "format=duration",
                     "-of", "default=noprint_wrappers=1:nokey=1",
@@ -2342,53 +2837,49 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 print(f"Using default duration: {duration} seconds")
             
             # Split the script into sentences
-            sentences = re.split(r'(?<=[.!?])\s+', script_text)
+            sentences = _SENTENCE_RE.split(script_text)
             
             # Calculate time per sentence
             sentence_count = len(sentences)
             time_per_sentence = duration / sentence_count
-            
-            # Prepare drawtext filters for each sentence
-            drawtext_filters = []
-            for i, sentence in enumerate(sentences):
-                # Clean the sentence to avoid FFmpeg command issues
-                clean_text = sentence.replace("'", "'").replace('"', '\\"').replace(':', '\\:').replace(',', '\\,')
-                
-                start_time = i * time_per_sentence
-                end_time = (i + 1) * time_per_sentence
-                
-                # Create a drawtext filter for this sentence
-                filter_text = (
-                    f"drawtext=text='{clean_text}':"
-                    f"fontfile=/Windows/Fonts/arial.ttf:fontsize=24:"
-                    f"fontcolor=white:box=1:boxcolor=black@0.7:boxborderw=5:"
-                    f"x=(w-text_w)/2:y=h-100:"
-                    f"enable='between(t,{start_time},{end_time})'"
-                )
-                drawtext_filters.append(filter_text)
-            
-            # Combine all drawtext filters with commas
-            filter_complex = ",".join(drawtext_filters)
-            
-            # Create tempfiles for the complex filter to avoid command line length issues
+
+            # Pre-render captions with Pillow so the filter graph is a plain overlay chain
+            if PIL_AVAILABLE:
+                timings = [(i * time_per_sentence, (i + 1) * time_per_sentence) for i in range(sentence_count)]
+                overlay_result = self._create_image_overlay_video(video_path, sentences, timings, output_path)
+                if overlay_result:
+                    return overlay_result
+                print("Image caption overlay failed, falling back to drawtext filters...")
+
+            # Write a drawtext filter for each sentence straight into a filter script file
+            # (avoids command line length issues and never builds the whole graph in memory)
             filter_file = os.path.join(os.path.dirname(output_path), "filter.txt")
             with open(filter_file, 'w', encoding='utf-8') as f:
-                f.write(filter_complex)
+                for i, sentence in enumerate(sentences):
+                    start_time = i * time_per_sentence
+                    end_time = (i + 1) * time_per_sentence
+                    
+                    if i > 0:
+                        f.write(",")  # Chain the drawtext filters
+                    f.write(_build_drawtext_filter(sentence, self.caption_font, start_time, end_time))
             
             # Run FFmpeg with the filter complex
             cmd = [
                 self.ffmpeg_path,
+                "-loglevel", "error", "-nostats",
+                *self._hwaccel_args(),
                 "-i", video_path,
                 "-filter_complex_script", filter_file,
                 "-c:v", "libx264",
-                "-preset", "fast", 
+                "-preset", "fast",
+                "-threads", "0",
                 "-crf", "23",
                 "-c:a", "copy",
                 "-y", output_path
             ]
             
             print(f"Running FFmpeg with filter_complex_script...")
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run(cmd, check=True, **self._error_stdio)
             
             # Clean up the filter file
             if os.path.exists(filter_file):
@@ -2403,11 +2894,130 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         
         except Exception as e:
             print(f"Error creating text overlay video: {e}")
+            _print_ffmpeg_stderr(e)
             import traceback
             traceback.print_exc()
             return None
 
-    def create_caption_overlay(self, video_path, script_text, output_path):
+    def _get_video_size(self, video_path):
+        """Get (width, height) of the first video stream using ffprobe"""
+        try:
+            cmd = [
+                self.ffprobe_path,
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "stream=width,height",
+                "-of", "csv=s=x:p=0",
+                video_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            width, height = result.stdout.strip().split('x')[:2]
+            return int(width), int(height)
+        except Exception as e:
+            print(f"Error getting video size: {e}")
+            return 1280, 720
+
+    def _render_caption_strip(self, lines, timings, video_w, video_h, output_dir, fontsize=24):
+        """
+        Render each caption line to a full-frame transparent PNG with Pillow
+
+        Parameters:
+        - lines: Caption text for each cue
+        - timings: (start, end) tuple in seconds for each cue
+        - video_w, video_h: Size of the video the captions are laid over
+        - output_dir: Directory to write the PNG files to
+        - fontsize: Caption font size in pixels
+
+        Returns:
+        - List of (png_path, start, end) tuples
+        """
+        font = _load_caption_font(fontsize)
+        padding = 5
+        rendered = []
+
+        for i, (line, (start, end)) in enumerate(zip(lines, timings)):
+            image = Image.new("RGBA", (video_w, video_h), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+
+            # Match the drawtext layout: centred horizontally, top edge at h-100
+            left, top, right, bottom = draw.textbbox((0, 0), line, font=font)
+            x = (video_w - (right - left)) // 2
+            y = video_h - 100
+            draw.rectangle(
+                [x - padding, y - padding, x + (right - left) + padding, y + (bottom - top) + padding],
+                fill=(0, 0, 0, 178)  # black@0.7
+            )
+            draw.text((x - left, y - top), line, font=font, fill=(255, 255, 255, 255))
+
+            png_path = os.path.join(output_dir, f"caption_{i}.png")
+            image.save(png_path)
+            rendered.append((png_path, start, end))
+
+        return rendered
+
+    def _create_image_overlay_video(self, video_path, lines, timings, output_path):
+        """
+        Burn pre-rendered caption images onto a video with a single overlay chain
+
+        Parameters:
+        - video_path: Path to the input video
+        - lines: Caption text for each cue
+        - timings: (start, end) tuple in seconds for each cue
+        - output_path: Path to save the output video
+
+        Returns:
+        - Path to the output video or None if failed
+        """
+        temp_dir = tempfile.mkdtemp()
+        try:
+            video_w, video_h = self._get_video_size(video_path)
+            captions = self._render_caption_strip(lines, timings, video_w, video_h, temp_dir)
+
+            cmd = [self.ffmpeg_path, "-loglevel", "error", "-nostats",
+                   *self._hwaccel_args(), "-i", video_path]
+            for png_path, _, _ in captions:
+                cmd += ["-i", png_path]
+
+            # [0:v][1:v]overlay=...[v1];[v1][2:v]overlay=...[v2];...
+            filter_parts = []
+            current = "[0:v]"
+            for i, (_, start, end) in enumerate(captions, 1):
+                filter_parts.append(f"{current}[{i}:v]overlay=0:0:enable='between(t,{start},{end})'[v{i}]")
+                current = f"[v{i}]"
+
+            filter_file = os.path.join(temp_dir, "filter.txt")
+            with open(filter_file, 'w', encoding='utf-8') as f:
+                f.write(";".join(filter_parts))
+
+            cmd += [
+                "-filter_complex_script", filter_file,
+                "-map", current,
+                "-map", "0:a?",
+                "-c:v", "libx264",
+                "-preset", "fast",
+                "-threads", "0",
+                "-crf", "23",
+                "-c:a", "copy",
+                "-y", output_path
+            ]
+
+            print(f"Running FFmpeg with {len(captions)} pre-rendered caption images...")
+            subprocess.run(cmd, check=True, **self._error_stdio)
+
+            if os.path.exists(output_path):
+                print(f"✓ Video with image caption overlays created: {output_path}")
+                return output_path
+            return None
+
+        except Exception as e:
+            print(f"Error creating image caption overlay: {e}")
+            _print_ffmpeg_stderr(e)
+            return None
+
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def create_caption_overlay(self, video_path, script_text, output_path, extra_outputs=None):
         """
         A super simple approach that just adds a fixed caption to the video
         
@@ -2415,6 +3025,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         - video_path: Path to the input video
         - script_text: Text for the caption
         - output_path: Path to save the output video
+        - extra_outputs: Optional list of (output_path, filter_suffix) tuples encoded from
+                         the same captioned frames in a single FFmpeg run
         
         Returns:
         - Path to the output video or None if failed
@@ -2427,41 +3039,42 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 # Take first 117 characters and add "..."
                 script_text = script_text[:117] + "..."
             
-            # Clean the text to avoid FFmpeg command issues
-            clean_text = script_text.replace("'", "'").replace('"', '\\"').replace(':', '\\:').replace(',', '\\,')
-            
             # Create a simple drawtext filter
-            filter_text = (
-                f"drawtext=text='{clean_text}':"
-                f"fontfile=/Windows/Fonts/arial.ttf:fontsize=20:"
-                f"fontcolor=white:box=1:boxcolor=black@0.7:boxborderw=5:"
-                f"x=(w-text_w)/2:y=h-80"
-            )
+            filter_text = _build_drawtext_filter(script_text, self.caption_font, y="h-80", fontsize=20)
             
             # Run FFmpeg with the simple filter
-            cmd = [
-                self.ffmpeg_path,
-                "-i", video_path,
-                "-vf", filter_text,
-                "-c:v", "libx264",
-                "-preset", "fast",
-                "-crf", "23", 
-                "-c:a", "copy",
-                "-y", output_path
-            ]
+            if extra_outputs:
+                cmd = self._build_subtitle_cmd(video_path, filter_text, output_path, extra_outputs)
+            else:
+                cmd = [
+                    self.ffmpeg_path,
+                    "-loglevel", "error", "-nostats",
+                    *self._hwaccel_args(),
+                    "-i", video_path,
+                    "-vf", filter_text,
+                    "-c:v", "libx264",
+                    "-preset", "fast",
+                    "-threads", "0",
+                    "-crf", "23", 
+                    "-c:a", "copy",
+                    "-y", output_path
+                ]
             
             print(f"Running simple caption overlay command...")
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            subprocess.run(cmd, check=True, **self._error_stdio)
             
             if os.path.exists(output_path):
                 print(f"✓ Video with caption overlay created: {output_path}")
                 return output_path
             else:
                 print("Failed to create video with caption overlay")
+                _remove_extra_outputs(extra_outputs)
                 return None
                 
         except Exception as e:
             print(f"Error creating caption overlay: {e}")
+            _print_ffmpeg_stderr(e)
+            _remove_extra_outputs(extra_outputs)
             return None
 
     def create_sequential_captions(self, video_path, script_text, output_path):
@@ -2476,13 +3089,14 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
         Returns:
         - Path to output video or None if failed
         """
+        temp_dir = None
         try:
             print("Creating video with sequential caption overlays...")
             
             # Get video duration
             try:
                 probe_cmd = [
-                    os.path.join(os.path.dirname(self.ffmpeg_path), "ffprobe"),
+                    self.ffprobe_path,
                     "-v", "error",
                     "-show_entries", "format=duration",
                     "-of", "default=noprint_wrappers=1:nokey=1",
@@ -2503,7 +3117,7 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             lines = []
             if len(script_text) > 150:
                 # Split by sentences
-                sentences = re.split(r'(?<=[.!?])\s+', script_text)
+                sentences = _SENTENCE_RE.split(script_text)
                 
                 # Now split long sentences into multiple lines
                 for sentence in sentences:
@@ -2536,14 +3150,11 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             
             # Create a sequence of temporary videos, each with a single caption
             temp_videos = []
-            base_name = os.path.splitext(output_path)[0]
+            temp_dir = _segment_temp_dir(os.path.getsize(video_path))
             
             for i, line in enumerate(lines):
-                # Clean the line for FFmpeg
-                clean_line = line.replace("'", "'").replace('"', '\\"').replace(':', '\\:').replace(',', '\\,')
-                
                 # Create a temporary output file for this segment
-                temp_output = f"{base_name}_temp_{i}.mp4"
+                temp_output = os.path.join(temp_dir, f"segment_{i}.mp4")
                 temp_videos.append(temp_output)
                 
                 # Calculate start and end times for this caption
@@ -2552,46 +3163,41 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 segment_duration = end_time - start_time
                 
                 # Create filter for this segment
+                filter_text = _build_drawtext_filter(line, self.caption_font)
+                
                 if i == 0:
                     # For the first segment, use the original video from start
-                    filter_text = (
-                        f"drawtext=text='{clean_line}':"
-                        f"fontfile=/Windows/Fonts/arial.ttf:fontsize=24:"
-                        f"fontcolor=white:box=1:boxcolor=black@0.7:boxborderw=5:"
-                        f"x=(w-text_w)/2:y=h-100"
-                    )
-                    
                     # Create the segment with the caption
                     segment_cmd = [
                         self.ffmpeg_path,
+                        "-loglevel", "error", "-nostats",
+                        *self._hwaccel_args(),
                         "-i", video_path,
                         "-vf", filter_text,
                         "-ss", "0",
                         "-t", str(segment_duration),
                         "-c:v", "libx264",
                         "-preset", "fast",
+                        "-threads", "0",
                         "-crf", "23",
                         "-c:a", "copy",
                         "-y", temp_output
                     ]
                 else:
                     # For subsequent segments, use the original video from appropriate offset
-                    filter_text = (
-                        f"drawtext=text='{clean_line}':"
-                        f"fontfile=/Windows/Fonts/arial.ttf:fontsize=24:"
-                        f"fontcolor=white:box=1:boxcolor=black@0.7:boxborderw=5:"
-                        f"x=(w-text_w)/2:y=h-100"
-                    )
-                    
                     # Create the segment with the caption
+                    # (-ss before -i seeks to the nearest keyframe instead of decoding from 0)
                     segment_cmd = [
                         self.ffmpeg_path,
+                        "-loglevel", "error", "-nostats",
+                        "-ss", str(start_time),
+                        *self._hwaccel_args(),
                         "-i", video_path,
                         "-vf", filter_text,
-                        "-ss", str(start_time),
                         "-t", str(segment_duration),
                         "-c:v", "libx264",
                         "-preset", "fast",
+                        "-threads", "0",
                         "-crf", "23",
                         "-c:a", "copy",
                         "-y", temp_output
@@ -2599,46 +3205,40 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 
                 print(f"Creating segment {i+1}/{len(lines)} with caption: {line[:30]}...")
                 try:
-                    subprocess.run(segment_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                    subprocess.run(segment_cmd, check=True, **self._error_stdio)
                     if not os.path.exists(temp_output) or os.path.getsize(temp_output) == 0:
                         print(f"Failed to create segment {i+1}, using simplified approach")
                         return self.create_caption_overlay(video_path, script_text, output_path)
                 except subprocess.CalledProcessError as e:
                     print(f"Error creating segment {i+1}: {e}")
+                    _print_ffmpeg_stderr(e)
                     # If any segment fails, fall back to the basic caption
                     return self.create_caption_overlay(video_path, script_text, output_path)
             
-            # Now concatenate all segments
-            concat_file = f"{base_name}_concat.txt"
-            with open(concat_file, 'w', encoding='utf-8') as f:
-                for temp_video in temp_videos:
-                    f.write(f"file '{os.path.abspath(temp_video)}'\n")
+            # Now concatenate all segments, streaming the concat list over stdin
+            concat_text = "".join(f"file '{os.path.abspath(temp_video)}'\n" for temp_video in temp_videos)
             
             # Run FFmpeg concat command to join all segments
             concat_cmd = [
                 self.ffmpeg_path,
+                "-loglevel", "error", "-nostats",
                 "-f", "concat",
                 "-safe", "0",
-                "-i", concat_file,
+                "-protocol_whitelist", "file,pipe",
+                "-i", "pipe:0",
                 "-c", "copy",
                 "-y", output_path
             ]
             
             print("Concatenating all segments...")
             try:
-                subprocess.run(concat_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                subprocess.run(concat_cmd, input=concat_text.encode('utf-8'), check=True, **self._error_stdio)
             except subprocess.CalledProcessError as e:
                 print(f"Error concatenating segments: {e}")
+                _print_ffmpeg_stderr(e)
                 # If concatenation fails, fall back to the basic caption
                 return self.create_caption_overlay(video_path, script_text, output_path)
             
-            # Clean up temporary files
-            for temp_video in temp_videos:
-                if os.path.exists(temp_video):
-                    os.remove(temp_video)
-            if os.path.exists(concat_file):
-                os.remove(concat_file)
-            
             if os.path.exists(output_path):
                 print(f"✓ Video with sequential captions created: {output_path}")
                 return output_path
@@ -2652,6 +3252,11 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             traceback.print_exc()
             # Fall back to the basic caption method
             return self.create_caption_overlay(video_path, script_text, output_path)
+        
+        finally:
+            # Clean up temporary segment files
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
 
     def debug_ffmpeg_command(self, cmd):
         """
@@ -2693,9 +3298,12 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             print(f"Exception running command: {e}")
             return False, "", str(e)
 
-    def create_video_from_text(self, title, text_content, output_dir=None):
+    def create_video_from_text(self, title, text_content, output_dir=None, wait_for_vertical=True):
         """
         Create a video directly from input text
+        
+        With wait_for_vertical=False a vertical version that still has to be
+        rendered is returned as a Future instead of a path.
         """
         try:
             print(f"Creating video from text: {title}")
@@ -2703,8 +3311,9 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             
             # Step 1: Generate script from the text content
             print("Generating script from text...")
-            script_generator = ScriptGenerator()
-            script = script_generator.generate_script(title, text_content)
+            if self._script_generator is None:
+                self._script_generator = ScriptGenerator()
+            script = self._script_generator.generate_script(title, text_content)
             
             if not script:
                 print("Failed to generate script from text content")
@@ -2717,11 +3326,12 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             
             # Step 2: Extract keywords
             print("Extracting keywords from script...")
-            keyword_extractor = KeywordExtractor()
+            if self._keyword_extractor is None:
+                self._keyword_extractor = KeywordExtractor()
+            keyword_extractor = self._keyword_extractor
             
             # Handle different parameter signatures
-            params = inspect.signature(keyword_extractor.extract_keywords).parameters
-            if len(params) == 3:  # If it needs two arguments (plus self)
+            if _extract_kw_arity(type(keyword_extractor)) == 3:  # If it needs two arguments (plus self)
                 keywords = keyword_extractor.extract_keywords(title, text_content)
             else:
                 keywords = keyword_extractor.extract_keywords(script)
@@ -2733,10 +3343,8 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             print(f"Enhanced keywords for video search: {', '.join(enhanced_keywords)}")
             
             # Step 3: Setup output directory
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             if not output_dir:
-                output_dir = os.path.join(self.output_dir, f"text2video_{timestamp}")
+                output_dir = os.path.join(self.output_dir, f"text2video_{_output_stamp()}")
             os.makedirs(output_dir, exist_ok=True)
             
             # Save the script to a file
@@ -2752,26 +3360,37 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             print(f"\nSearching for up to {target_video_count} videos using keywords...")
             keywords_to_search = enhanced_keywords[:target_video_count]
             
-            pexels_api = PexelsAPI()
+            if self._pexels_api is None:
+                self._pexels_api = PexelsAPI()
+            pexels_api = self._pexels_api
+            search_results = pexels_api.search_videos_many(keywords_to_search, per_page=3)
             for keyword in keywords_to_search:
                 if len(selected_videos_raw) >= target_video_count:
                     break  # Stop if we already have enough videos
                     
-                print(f"Searching Pexels for videos with query: '{keyword}'...")
-                videos = pexels_api.search_videos(keyword, per_page=3)
-                
-                if videos:
-                    for video in videos:
-                        video_url = video.get('url')
-                        if video_url and video_url not in footage_pool_urls:
-                            selected_videos_raw.append({
-                                "url": video_url,
-                                "keyword": keyword
-                            })
-                            footage_pool_urls.add(video_url)
-                            print(f"Added video for '{keyword}': {video_url}")
-                            break  # Just get one video per keyword
-            
+                # Just get one video per keyword
+                video_url = _first_new_clip_url(search_results.get(keyword, []), footage_pool_urls, mp4_only=False)
+                if video_url:
+                    selected_videos_raw.append({
+                        "url": video_url,
+                        "keyword": keyword
+                    })
+                    footage_pool_urls.add(video_url)
+                    print(f"Added video for '{keyword}': {video_url}")
+
+            # Top up with generic footage, searching all the missing slots' keywords at once
+            if len(selected_videos_raw) < target_video_count:
+                needed = target_video_count - len(selected_videos_raw)
+                print(f"Found only {len(selected_videos_raw)} videos. Trying {needed} generic keywords...")
+                generic_pick = random.sample(["news", "world", "city", "technology", "business", "people"], k=needed)
+                search_results = pexels_api.search_videos_many(generic_pick, per_page=3)
+                for keyword in generic_pick:
+                    video_url = _first_new_clip_url(search_results.get(keyword, []), footage_pool_urls, mp4_only=False)
+                    if video_url:
+                        selected_videos_raw.append({"url": video_url, "keyword": f"generic_{keyword}"})
+                        footage_pool_urls.add(video_url)
+                        print(f"Added generic video for '{keyword}': {video_url}")
+
             # Step 5: Generate speech from script
             print("\nGenerating speech from script...")
             audio_file = os.path.join(output_dir, "narration.mp3")
@@ -2783,36 +3402,36 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
                 return None, "No videos found for keywords"
             
             print(f"\nCreating video with {len(selected_videos_raw)} footage clips...")
-            final_video = self.create_video_with_narration(script, selected_videos_raw)
+            # Ask the subtitle stage to also render the vertical version in the same pass
+            fused_vertical_path = os.path.join(output_dir, "video_vertical.mp4")
+            final_video = self.create_video_with_narration(
+                script, selected_videos_raw,
+                extra_outputs=[(fused_vertical_path, _VERTICAL_PAD_FILTER)]
+            )
             
             if final_video and os.path.exists(final_video):
                 print(f"\nVideo created successfully: {final_video}")
                 
+                if _is_nonempty_file(fused_vertical_path):
+                    print(f"Vertical video created: {fused_vertical_path}")
+                    return final_video, None, fused_vertical_path
+                # Don't leave an empty file from a failed fused run next to the real output
+                _remove_extra_outputs([(fused_vertical_path, None)])
+                
                 # Step 7: Create vertical version for social media
-                try:
-                    print("\nCreating vertical version for social media...")
-                    vertical_path = final_video.replace('.mp4', '_vertical.mp4')
-                    
-                    cmd = [
-                        "ffmpeg",
-                        "-i", final_video,
-                        "-vf", "scale=720:-2,pad=720:1280:(ow-iw)/2:(oh-ih)/2:black",
-                        "-c:v", "libx264",
-                        "-preset", "fast",
-                        "-c:a", "copy",
-                        "-y", vertical_path
-                    ]
-                    
-                    subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                    
-                    if os.path.exists(vertical_path):
-                        print(f"Vertical video created: {vertical_path}")
-                        return final_video, None, vertical_path
-                    else:
-                        # Return just the horizontal version if vertical fails
-                        return final_video, None
-                except Exception as e:
-                    print(f"Error creating vertical video: {e}")
+                # (only needed when the subtitle stage fell back to a method without extra outputs)
+                print("\nCreating vertical version for social media...")
+                vertical_path = final_video.replace('.mp4', '_vertical.mp4')
+                
+                if not wait_for_vertical:
+                    # Let the caller carry on while FFmpeg runs; the Future resolves to the path or None
+                    return final_video, None, _FFMPEG_POOL.submit(self._pad_to_vertical, final_video, vertical_path)
+                
+                vertical_path = self._pad_to_vertical(final_video, vertical_path)
+                if vertical_path:
+                    return final_video, None, vertical_path
+                else:
+                    # Return just the horizontal version if vertical fails
                     return final_video, None
             else:
                 return None, "Failed to create video"
@@ -2866,6 +3485,79 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
             print(f"Error creating vertical video: {e}")
             return None
 
+    def _pad_to_vertical(self, input_file, output_file):
+        """
+        Letterbox a video into a 9:16 frame
+        
+        Returns:
+        - Path to the vertical video or None if failed
+        """
+        try:
+            width, height = self._get_video_size(input_file)
+            if height and width / height <= 9 / 16 + 0.01:
+                print(f"Video is already vertical, linking without re-encoding: {input_file}")
+                _link_or_copy(input_file, output_file)
+                return output_file
+            small_source = height <= 720
+            
+            def build_cmd(use_nvenc):
+                cmd = [self.ffmpeg_path, "-loglevel", "error", "-nostats"]
+                if use_nvenc:
+                    cmd += ["-hwaccel", "cuda"]
+                cmd += ["-i", input_file, "-vf", _VERTICAL_PAD_FILTER]
+                cmd += self._vertical_encoder_args(use_nvenc, small_source)
+                cmd += ["-c:a", "copy", "-y", output_file]
+                return cmd
+            
+            if self._run_vertical_cmd(build_cmd) and _is_nonempty_file(output_file):
+                print(f"Vertical video created: {output_file}")
+                return output_file
+            print("Failed to create vertical video")
+            return None
+        except Exception as e:
+            print(f"Error creating vertical video: {e}")
+            return None
+
+    def _vertical_encoder_args(self, use_nvenc, small_source=False):
+        """
+        Video encoder options for vertical output (NVENC when available, else libx264)
+        
+        Parameters:
+        - use_nvenc: Encode on the GPU with h264_nvenc
+        - small_source: Source is 720p or smaller, so a faster x264 preset loses nothing visible
+        """
+        if use_nvenc:
+            return ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23"]
+        return [
+            "-c:v", "libx264",
+            "-preset", "veryfast" if small_source else "fast",
+            "-threads", "0",
+            "-tune", "fastdecode",  # Vertical output is mostly played back on phones
+        ]
+
+    def _run_vertical_cmd(self, build_cmd):
+        """
+        Run a vertical conversion, trying NVENC first and falling back to libx264
+        
+        Parameters:
+        - build_cmd: Callable taking use_nvenc (bool) and returning the FFmpeg command
+        
+        Returns:
+        - True if FFmpeg exited successfully
+        """
+        if _has_nvenc(self.ffmpeg_path):
+            result = subprocess.run(build_cmd(True), **self._error_stdio)
+            if result.returncode == 0:
+                return True
+            # The encoder can be compiled in without a usable GPU on this host
+            print("NVENC encoding failed, falling back to libx264...")
+        
+        result = subprocess.run(build_cmd(False), **self._error_stdio)
+        if result.returncode != 0:
+            print(f"FFmpeg vertical conversion failed: {result.stderr.decode(errors='replace')[-2000:]}")
+            return False
+        return True
+
 # Simple test script
 if __name__ == "__main__":
     print("Initializing News System...")
@@ -2888,11 +3580,7 @@ if __name__ == "__main__":
             us_news = news_api.search_news(query="United States", max_results=8)
             if not us_news.empty:
                 print("\nTop news about the United States:")
-                for i, (_, article) in enumerate(us_news.iterrows(), 1):
-                    print(f"{i}. {article['title']} ({article['source']})")
-                    print(f"   {article['description'][:100]}...")
-                    print(f"   URL: {article['url']}")
-                    print()
+                _print_articles(us_news)
                 
                 articles_df = us_news
                 top_titles = us_news["title"].tolist()
@@ -2908,11 +3596,7 @@ if __name__ == "__main__":
             
             if not headlines.empty:
                 print("\nTop 8 news headlines in the United States:")
-                for i, (_, article) in enumerate(headlines.iterrows(), 1):
-                    print(f"{i}. {article['title']} ({article['source']})")
-                    print(f"   {article['description'][:100]}...")
-                    print(f"   URL: {article['url']}")
-                    print()
+                _print_articles(headlines)
                 
                 articles_df = headlines
                 top_titles = headlines["title"].tolist()
@@ -2932,12 +3616,7 @@ if __name__ == "__main__":
             
             if not rss_headlines.empty:
                 print("\nTop news headlines from Romanian sources:")
-                for i, (_, article) in enumerate(rss_headlines.iterrows(), 1):
-                    print(f"{i}. {article['title']} ({article['source']})")
-                    if 'description' in article and article['description']:
-                        print(f"   {article['description'][:100]}...")
-                    print(f"   URL: {article['url']}")
-                    print()
+                _print_articles(rss_headlines)
                 
                 articles_df = rss_headlines
                 top_titles = rss_headlines["title"].tolist()[:8]
@@ -2954,28 +3633,32 @@ if __name__ == "__main__":
                     "USA Today": "http://rssfeeds.usatoday.com/usatoday-NewsTopStories"
                 }
                 
-                # Try each US RSS feed
-                for feed_name, feed_url in us_rss_feeds.items():
-                    try:
-                        print(f"\nTrying US RSS feed: {feed_name}")
-                        us_rss_parser = RSSFeedParser(feed_url)
-                        us_feed_articles = us_rss_parser.get_articles(max_results=8)
-                        
-                        if not us_feed_articles.empty:
-                            print(f"\nTop 8 articles from {feed_name}:")
-                            for i, (_, article) in enumerate(us_feed_articles.iterrows(), 1):
-                                print(f"{i}. {article['title']}")
-                                print(f"   {article['description'][:100] if 'description' in article and article['description'] else ''}...")
-                                print(f"   URL: {article['url']}")
-                                print()
+                # Query all US RSS feeds at once and use whichever answers first with articles
+                executor = ThreadPoolExecutor(max_workers=len(us_rss_feeds))
+                futures = {
+                    executor.submit(rss_scraper.fetch_feed, feed_name, feed_url, 8): feed_name
+                    for feed_name, feed_url in us_rss_feeds.items()
+                }
+                try:
+                    for future in as_completed(futures):
+                        feed_name = futures[future]
+                        try:
+                            us_feed_articles = pd.DataFrame(future.result())
                             
-                            articles_df = us_feed_articles
-                            top_titles = us_feed_articles["title"].tolist()
-                            break
-                        else:
-                            print(f"No articles found in {feed_name} feed.")
-                    except Exception as e:
-                        print(f"Error with {feed_name} RSS feed: {e}")
+                            if not us_feed_articles.empty:
+                                print(f"\nTop 8 articles from {feed_name}:")
+                                _print_articles(us_feed_articles, show_source=False)
+                                
+                                articles_df = us_feed_articles
+                                top_titles = us_feed_articles["title"].tolist()
+                                break
+                            else:
+                                print(f"No articles found in {feed_name} feed.")
+                        except Exception as e:
+                            print(f"Error with {feed_name} RSS feed: {e}")
+                finally:
+                    # Don't wait on feeds that are still loading
+                    executor.shutdown(wait=False, cancel_futures=True)
                 
                 # If still no articles, fall back to predefined topics
                 if not top_titles:
@@ -3034,8 +3717,8 @@ if __name__ == "__main__":
         # Use environment variable for API key
         script_generator = ScriptGenerator()
         keyword_extractor = KeywordExtractor()
-        pexels_api = PexelsAPI()
-        video_creator = VideoCreator()
+        pexels_api = PexelsAPI(cache_db=db)
+        video_creator = None  # Created on first use; only options 2 and 5 render video
         
         while True:
             print("\n--- MAIN MENU ---")
@@ -3048,6 +3731,9 @@ if __name__ == "__main__":
             
             choice = input("\nEnter your choice (1-6): ")  # Update prompt to 1-6
             
+            if choice in ("2", "5") and video_creator is None:
+                video_creator = VideoCreator()
+            
             if choice == "1":
                 # Get unused articles
                 unused_articles = db.get_unused_articles()
@@ -3139,32 +3825,22 @@ if __name__ == "__main__":
 
                         print(f"\nSearching for up to {target_video_count} videos using keywords...")
                         keywords_to_search = enhanced_keywords[:target_video_count] # Use first 5 keywords
+                        # Fire all searches at once; selection below keeps keyword order
+                        search_results = pexels_api.search_videos_many(keywords_to_search, per_page=3)
 
                         for keyword in keywords_to_search:
                             if len(selected_videos_raw) >= target_video_count:
                                 break # Stop if we already have 5
 
-                            print(f"Searching Pexels for videos with query: '{keyword}'...")
-                            videos = pexels_api.search_videos(keyword, per_page=3)
+                            videos = search_results.get(keyword, [])
                             if videos:
                                 print(f"Found {len(videos)} potential videos for '{keyword}'.")
-                                video_added_for_keyword = False
-                                for video_info in videos:
-                                    video_url = video_info.get('url')
-                                    
-                                    if video_url and video_url.endswith('.mp4'):
-                                        if video_url not in footage_pool_urls:
-                                            print(f"  + Adding video for '{keyword}': {video_url}")
-                                            selected_videos_raw.append({"url": video_url, "keyword": keyword})
-                                            footage_pool_urls.add(video_url)
-                                            video_added_for_keyword = True
-                                            break
-                                        # else: # Optional debug
-                                        #    print(f"  - Skipping video for '{keyword}' (duplicate URL: {video_url})")
-                                    # else: # Optional debug
-                                    #    if not video_url: print(f"  - Skipping video for '{keyword}' (no URL found in video_info)")
-                                    #    else: print(f"  - Skipping video for '{keyword}' (URL not MP4: {video_url})")
-                                if not video_added_for_keyword:
+                                video_url = _first_new_clip_url(videos, footage_pool_urls)
+                                if video_url:
+                                    print(f"  + Adding video for '{keyword}': {video_url}")
+                                    selected_videos_raw.append({"url": video_url, "keyword": keyword})
+                                    footage_pool_urls.add(video_url)
+                                else:
                                      print(f"  - Could not find a suitable unique video for '{keyword}' from results.")
                             else:
                                 print(f"No videos found for keyword '{keyword}'")
@@ -3173,36 +3849,30 @@ if __name__ == "__main__":
                         if len(selected_videos_raw) < target_video_count:
                             print(f"\nFound only {len(selected_videos_raw)} videos. Trying generic keywords for the remainder...")
                             generic_keywords = ["news", "world", "city", "technology", "business", "people"]
-                            random.shuffle(generic_keywords) # Mix them up
-
-                            for keyword in generic_keywords:
-                                if len(selected_videos_raw) >= target_video_count:
-                                    break # Stop if we have 5
-
-                                print(f"Searching Pexels for generic videos with query: '{keyword}'...")
-                                videos = pexels_api.search_videos(keyword, per_page=3)
-                                if videos:
-                                    print(f"Found {len(videos)} potential generic videos for '{keyword}'.")
-                                    video_added_for_keyword = False
-                                    for video_info in videos:
-                                        video_url = video_info.get('url')
-
-                                        if video_url and video_url.endswith('.mp4'):
-                                            if video_url not in footage_pool_urls:
-                                                print(f"  + Adding generic video for '{keyword}': {video_url}")
-                                                selected_videos_raw.append({"url": video_url, "keyword": f"generic_{keyword}"})
-                                                footage_pool_urls.add(video_url)
-                                                video_added_for_keyword = True
-                                                break
-                                            # else: # Optional debug
-                                            #    print(f"  - Skipping generic video for '{keyword}' (duplicate URL: {video_url})")
-                                        # else: # Optional debug
-                                        #    if not video_url: print(f"  - Skipping generic video for '{keyword}' (no URL found in video_info)")
-                                        #    else: print(f"  - Skipping generic video for '{keyword}' (URL not MP4: {video_url})")
-                                    if not video_added_for_keyword:
-                                        print(f"  - Could not find a suitable unique generic video for '{keyword}' from results.")
-                                else:
-                                    print(f"No generic videos found for keyword '{keyword}'")
+                            # Only search as many generic keywords as clips are missing, and
+                            # draw more from the rest if some of those come back empty
+                            while generic_keywords and len(selected_videos_raw) < target_video_count:
+                                needed = target_video_count - len(selected_videos_raw)
+                                generic_pick = random.sample(generic_keywords, k=min(needed, len(generic_keywords)))
+                                generic_keywords = [k for k in generic_keywords if k not in generic_pick]
+                                search_results = pexels_api.search_videos_many(generic_pick, per_page=3)
+
+                                for keyword in generic_pick:
+                                    if len(selected_videos_raw) >= target_video_count:
+                                        break # Stop if we have 5
+
+                                    videos = search_results.get(keyword, [])
+                                    if videos:
+                                        print(f"Found {len(videos)} potential generic videos for '{keyword}'.")
+                                        video_url = _first_new_clip_url(videos, footage_pool_urls)
+                                        if video_url:
+                                            print(f"  + Adding generic video for '{keyword}': {video_url}")
+                                            selected_videos_raw.append({"url": video_url, "keyword": f"generic_{keyword}"})
+                                            footage_pool_urls.add(video_url)
+                                        else:
+                                            print(f"  - Could not find a suitable unique generic video for '{keyword}' from results.")
+                                    else:
+                                        print(f"No generic videos found for keyword '{keyword}'")
 
 
                         if not selected_videos_raw:
@@ -3332,7 +4002,8 @@ if __name__ == "__main__":
                 print("\nGenerating video, this may take some time...")
                 
                 # Call our method with proper handling of returned values
-                result = video_creator.create_video_from_text(title, custom_text)
+                # The vertical encode keeps running in the background while we finish up here
+                result = video_creator.create_video_from_text(title, custom_text, wait_for_vertical=False)
                 
                 # Check what was returned
                 if len(result) == 2:
@@ -3345,38 +4016,26 @@ if __name__ == "__main__":
                     print(f"\nVideo created successfully!")
                     print(f"Video saved to: {video_path}")
                     
-                    if vertical_path and os.path.exists(vertical_path):
-                        print(f"Vertical video for social media saved to: {vertical_path}")
-                    
                     # Add to database
                     try:
-                        video_id = int(datetime.now().strftime("%Y%m%d%H%M%S"))
-                        
                         # Extract keywords for database
                         keywords = keyword_extractor.extract_keywords(title, custom_text)
                         
+                        if isinstance(vertical_path, Future):
+                            print("Waiting for vertical video to finish...")
+                            vertical_path = vertical_path.result()
+                        
+                        if vertical_path and os.path.exists(vertical_path):
+                            print(f"Vertical video for social media saved to: {vertical_path}")
+                        
                         # Create video path string
                         video_path_str = video_path
                         if vertical_path:
                             video_path_str = f"{video_path}|{vertical_path}"
                         
-                        db.cursor.execute(
-                            """
-                            INSERT INTO videos 
-                            (id, title, script_text, video_path, keywords, created_at) 
-                            VALUES (?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                video_id,
-                                title,
-                                custom_text,
-                                video_path_str,
-                                ",".join(keywords),
-                                datetime.now().isoformat()
-                            )
-                        )
-                        db.conn.commit()
-                        print(f"Video saved to database with ID: {video_id}")
+                        video_id = db.add_custom_text_video(title, custom_text, video_path_str, keywords)
+                        if video_id:
+                            print(f"Video saved to database with ID: {video_id}")
                     except Exception as e:
                         print(f"Error saving to database: {e}")
                 else:
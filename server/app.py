@@ -1,16 +1,25 @@
 # server/app.py
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory
+from flask.logging import default_handler
 from flask_cors import CORS
 import os
 import sys
-import traceback
+import logging
+import logging.handlers
+import queue
+import atexit
 import json
 import sqlite3
-from datetime import datetime
 import time
 import threading
+from contextlib import contextmanager
 import subprocess
 import tempfile
+import uuid
+import functools
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the specific classes we need from AutoVid
 from AutoVid import ScriptGenerator
@@ -19,13 +28,6 @@ from AutoVid import GNewsAPI
 # Import pandas for DataFrame handling
 import pandas as pd
 
-# Add these lines to import the database class:
-try:
-    from AutoVid import SimpleDB  # Try to import the database class
-except ImportError:
-    # If SimpleDB isn't directly importable, we'll use our own implementation
-    pass
-
 try:
     from AutoVid import VideoCreator
     has_video_creator = True
@@ -34,12 +36,43 @@ except ImportError:
     has_video_creator = False
     print("VideoCreator not available - video generation will be limited")
 
+try:
+    import orjson
+    has_orjson = True
+except ImportError:
+    has_orjson = False
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if has_orjson else 0
+
+def ojson(obj, status=200):
+    """
+    JSON response for the API endpoints.
+
+    Serializes with orjson when it is installed, which is noticeably cheaper than
+    jsonify for the larger article payloads, and falls back to jsonify otherwise.
+
+    Parameters:
+    - obj: JSON-serializable payload
+    - status: HTTP status code
+
+    Returns:
+    - Flask Response with mimetype application/json
+    """
+    if not has_orjson:
+        response = jsonify(obj)
+        response.status_code = status
+        return response
+    return Response(orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS),
+                    status=status, mimetype='application/json')
+
 # Set FFmpeg path automatically in production
 if os.environ.get('RENDER'):
     # For Render deployment, FFmpeg is at this location
     os.environ['FFMPEG_BINARY'] = '/usr/bin/ffmpeg'
 
 app = Flask(__name__, static_folder='static', static_url_path='')
+# Compact JSON even in debug mode (only affects the jsonify fallback in ojson)
+app.config['JSONIFY_PRETTYPRINT_REGULAR'] = False
 CORS(app, resources={r"/api/*": {"origins": [
     "http://localhost:3000",
     "http://localhost:5173",
@@ -48,13 +81,37 @@ CORS(app, resources={r"/api/*": {"origins": [
     "*"  # For development only - remove in production
 ]}})
 
-# Setup static folders first
+# Handler errors are logged through a queue: request and job threads only enqueue the
+# record, and a listener thread does the stderr writes instead of each thread taking the lock
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+app.logger.removeHandler(default_handler)
+app.logger.addHandler(_queue_handler)
+app.logger.setLevel(logging.INFO)
+_log_listener.start()
+
+def _restart_log_listener():
+    """Give a forked process (a gunicorn worker under preload_app) its own queue and listener thread"""
+    global _log_queue, _log_listener
+    _log_queue = queue.SimpleQueue()
+    _queue_handler.queue = _log_queue
+    _log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+
+os.register_at_fork(after_in_child=_restart_log_listener)
+atexit.register(lambda: _log_listener.stop())
+
+# Setup static folders first. These absolute paths are computed once and used by every
+# handler, so nothing depends on the working directory gunicorn was started from.
 app_root = os.path.dirname(os.path.abspath(__file__))
 static_dir = os.path.join(app_root, 'static')
+STATIC_ROOT = Path(static_dir).resolve()
 static_videos_dir = os.path.join(static_dir, 'videos')
 
-# Create necessary directories
-os.makedirs(static_dir, exist_ok=True)
+# Create necessary directories (makedirs creates static/ on the way)
 os.makedirs(static_videos_dir, exist_ok=True)
 print(f"Static directory: {static_dir}")
 print(f"Static videos directory: {static_videos_dir}")
@@ -62,62 +119,217 @@ print(f"Static videos directory: {static_videos_dir}")
 # Configure paths and initialize components
 script_generator = ScriptGenerator()
 
-# Find where you set up static folder configuration
-# Ensure static folders use absolute paths
 app.config['STATIC_FOLDER'] = 'static'
-os.makedirs(os.path.join(app.config['STATIC_FOLDER'], 'videos'), exist_ok=True)
 
 # Add at the top after imports
 print(f"Current working directory: {os.getcwd()}")
 print(f"App file directory: {os.path.dirname(os.path.abspath(__file__))}")
 
+# Statements used by the endpoints. Keeping one copy of each text means every
+# per-thread connection hits sqlite3's prepared-statement cache on repeat requests.
+SQL_UNUSED_ARTICLES = """
+    SELECT DISTINCT a.id, a.title, a.description, a.source 
+    FROM articles a
+    LEFT JOIN scripts s ON a.id = s.article_id
+    LEFT JOIN videos v ON s.id = v.script_id
+    WHERE s.id IS NULL OR v.id IS NULL
+    ORDER BY a.id DESC
+    LIMIT ?
+"""
+SQL_GET_ARTICLE = "SELECT id, title, description FROM articles WHERE id = ?"
+SQL_GET_SCRIPT_WITH_TITLE = """
+    SELECT s.id, s.script_text, a.title 
+    FROM scripts s
+    JOIN articles a ON s.article_id = a.id
+    WHERE s.id = ?
+"""
+# Changes whenever a video row is added or removed; shared by all workers, unlike an in-process counter
+SQL_VIDEOS_VERSION = "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM videos"
+SQL_RECENT_VIDEOS = """
+    SELECT v.id, v.script_id, v.created_at, 
+           s.article_id, a.title,
+           CASE WHEN v.video_path LIKE '/static/%' THEN v.video_path
+                ELSE '/static/' || v.video_path END AS video_url
+    FROM videos v
+    JOIN scripts s ON v.script_id = s.id
+    JOIN articles a ON s.article_id = a.id
+    ORDER BY v.created_at DESC
+    LIMIT 50
+"""
+SQL_LATEST_VIDEO_FOR_SCRIPT = "SELECT id, video_path, created_at FROM videos WHERE script_id = ? ORDER BY created_at DESC LIMIT 1"
+SQL_INSERT_VIDEO = "INSERT INTO videos (script_id, video_path, created_at) VALUES (?, ?, datetime('now')) RETURNING id"
+SQL_INSERT_SCRIPT = "INSERT INTO scripts (article_id, script_text, created_at) VALUES (?, ?, datetime('now')) RETURNING id"
+SQL_ALL_ARTICLE_IDS = "SELECT id FROM articles"
+SQL_RECENT_SCRIPT_FOR_ARTICLE = """
+    SELECT id, script_text FROM scripts
+    WHERE article_id = ? AND created_at >= datetime('now', ?)
+    ORDER BY id DESC LIMIT 1
+"""
+# IDs are passed as one JSON array so the statement text is the same for any batch size
+SQL_EXISTING_ARTICLE_IDS = "SELECT id FROM articles WHERE id IN (SELECT value FROM json_each(?))"
+SQL_INSERT_ARTICLE = """
+    INSERT OR IGNORE INTO articles 
+    (id, title, url, source, description, content, published_at) 
+    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+"""
+SQL_SET_VIDEO_JOB = """
+    INSERT INTO video_jobs (job_key, status, error, details, updated_at)
+    VALUES (?, ?, ?, ?, datetime('now'))
+    ON CONFLICT (job_key) DO UPDATE SET
+        status = excluded.status, error = excluded.error,
+        details = excluded.details, updated_at = excluded.updated_at
+"""
+SQL_GET_VIDEO_JOB = "SELECT status, error, details FROM video_jobs WHERE job_key = ?"
+
+def stable_article_id(url, title):
+    """
+    Article ID derived from the URL (or the title when there is no URL).
+
+    Uses a 40-bit blake2b digest rather than hash(), which is salted per process and
+    gave the same article different IDs in each gunicorn worker and after restarts.
+
+    Parameters:
+    - url: article URL, may be empty
+    - title: article title
+
+    Returns:
+    - int: ID that is the same across processes
+    """
+    key = url or title or ''
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=5).digest(), 'big')
+
 # Database connection helper
 class SimpleDB:
     def __init__(self, db_path):
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        self.db_path = db_path
+        # Request threads and video jobs each get their own connection, so concurrent
+        # execute/fetch/lastrowid calls can't interleave. WAL lets the readers run
+        # alongside a write; writes themselves go through one lock (see write()).
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
         self._create_tables()
+    
+    @property
+    def conn(self):
+        """This thread's connection (opened on first use)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: plain reads don't open implicit transactions, and write()
+            # starts its own with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            if os.environ.get('SQL_TRACE'):
+                # Debug aid: log every statement to check the hot paths reuse constant SQL text
+                conn.set_trace_callback(lambda statement: print(f"[SQL] {statement}"))
+            # WAL lets readers run during a write and needs one fsync per commit instead of two
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA mmap_size=268435456")
+                conn.execute("PRAGMA cache_size=-65536")
+                # Wait for a competing writer instead of failing with "database is locked"
+                conn.execute("PRAGMA busy_timeout=5000")
+            except sqlite3.Error as e:
+                print(f"Could not apply SQLite pragmas for {self.db_path}: {e}")
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def read(self):
+        """Cursor on this thread's connection for SELECTs"""
+        cursor = self.conn.cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def write(self):
+        """Cursor inside a transaction, one writer at a time; commits on success and rolls back on error"""
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            try:
+                # Take the write lock up front so a worker in another process can't make
+                # this transaction fail halfway through with "database is locked"
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    yield cursor
+                except BaseException:
+                    cursor.execute("ROLLBACK")
+                    raise
+                cursor.execute("COMMIT")
+            finally:
+                cursor.close()
+    
+    def close(self):
+        """Close this thread's connection; the next use of conn opens a new one"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
         
     def _create_tables(self):
         """Create necessary database tables if they don't exist."""
-        # Articles table
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS articles (
-                id INTEGER PRIMARY KEY,
-                title TEXT NOT NULL,
-                url TEXT,
-                source TEXT,
-                description TEXT,
-                content TEXT,
-                published_at TIMESTAMP
-            )
-        """)
-        
-        # Scripts table
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS scripts (
-                id INTEGER PRIMARY KEY,
-                article_id INTEGER,
-                script_text TEXT NOT NULL,
-                created_at TIMESTAMP,
-                FOREIGN KEY (article_id) REFERENCES articles (id)
-            )
-        """)
-        
-        # Videos table
-        self.cursor.execute("""
-            CREATE TABLE IF NOT EXISTS videos (
-                id INTEGER PRIMARY KEY,
-                script_id INTEGER,
-                video_path TEXT NOT NULL,
-                created_at TIMESTAMP,
-                FOREIGN KEY (script_id) REFERENCES scripts (id)
-            )
-        """)
-        
-        # Commit the changes
-        self.conn.commit()
+        with self.write() as cursor:
+            # Articles table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    url TEXT,
+                    source TEXT,
+                    description TEXT,
+                    content TEXT,
+                    published_at TIMESTAMP
+                )
+            """)
+        
+            # Scripts table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scripts (
+                    id INTEGER PRIMARY KEY,
+                    article_id INTEGER,
+                    script_text TEXT NOT NULL,
+                    created_at TIMESTAMP,
+                    FOREIGN KEY (article_id) REFERENCES articles (id)
+                )
+            """)
+        
+            # Videos table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS videos (
+                    id INTEGER PRIMARY KEY,
+                    script_id INTEGER,
+                    video_path TEXT NOT NULL,
+                    created_at TIMESTAMP,
+                    FOREIGN KEY (script_id) REFERENCES scripts (id)
+                )
+            """)
+        
+            # Background video jobs, keyed by script ID or custom-text job ID. Kept here rather
+            # than in memory so any gunicorn worker can answer a status poll for any job.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS video_jobs (
+                    job_key TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    details TEXT,
+                    updated_at TIMESTAMP
+                )
+            """)
+        
+            # Foreign keys used by the unused-articles/video joins and video status lookups
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scripts_article_id ON scripts (article_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_script_id ON videos (script_id, created_at)")
+            # /api/videos reads the newest 50 rows; articles need no extra index since id is the rowid
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_created_at ON videos (created_at DESC)")
+            
+            # Give the planner statistics the first time, afterwards only refresh what changed
+            has_stats = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            ).fetchone()
+            cursor.execute("PRAGMA optimize" if has_stats else "ANALYZE")
         print("Database tables created if they didn't exist")
         
     def mark_article_as_used(self, article_id):
@@ -126,34 +338,40 @@ class SimpleDB:
         
     def add_script(self, article_id, script_text):
         # Implementation to add script
-        self.cursor.execute(
-            "INSERT INTO scripts (article_id, script_text, created_at) VALUES (?, ?, datetime('now'))",
-            (article_id, script_text)
-        )
-        self.conn.commit()
-        return self.cursor.lastrowid
+        with self.write() as cursor:
+            return cursor.execute(SQL_INSERT_SCRIPT, (article_id, script_text)).fetchone()[0]
+
+    def add_video(self, script_id, video_path):
+        """Record a rendered video and return its row ID (script_id 0 for custom-text videos)."""
+        with self.write() as cursor:
+            return cursor.execute(SQL_INSERT_VIDEO, (script_id, video_path)).fetchone()[0]
+
+    def set_video_job(self, job_key, status, error=None, details=None):
+        """Insert or replace the state of a background video job (details is a JSON-serializable dict)."""
+        with self.write() as cursor:
+            cursor.execute(SQL_SET_VIDEO_JOB, (str(job_key), status, error, json.dumps(details or {})))
+
+    def get_video_job(self, job_key):
+        """State of a background video job as a status/error/details dict, or None if unknown."""
+        with self.read() as cursor:
+            row = cursor.execute(SQL_GET_VIDEO_JOB, (str(job_key),)).fetchone()
+        if row is None:
+            return None
+        status, error, details = row
+        return {"status": status, "error": error, **json.loads(details or "{}")}
 
     def get_unused_articles(self, limit=8):
-        """Gets articles that haven't been used for videos yet."""
-        # Use DISTINCT to avoid duplicates
-        self.cursor.execute("""
-            SELECT DISTINCT a.id, a.title, a.description, a.source 
-            FROM articles a
-            LEFT JOIN scripts s ON a.id = s.article_id
-            LEFT JOIN videos v ON s.id = v.script_id
-            WHERE s.id IS NULL OR v.id IS NULL
-            ORDER BY a.id DESC
-            LIMIT ?
-        """, (limit,))
-        
-        return self.cursor.fetchall()
+        """Gets articles that haven't been used for videos yet, as id/title/description/source dicts."""
+        # Use DISTINCT to avoid duplicates; build the dicts straight off the cursor
+        with self.read() as cursor:
+            return [dict(row) for row in cursor.execute(SQL_UNUSED_ARTICLES, (limit,))]
 
     def add_news_articles(self, articles_df):
         """Add news articles from DataFrame to database."""
         print(f"Adding {len(articles_df)} articles to database")
-        added_ids = []
+        rows = []
         
-        for _, article in articles_df.iterrows():
+        for article in articles_df.to_dict('records'):
             # Extract article data, with fallbacks for missing fields
             title = article.get('title', 'No Title')
             url = article.get('url', '')
@@ -161,33 +379,85 @@ class SimpleDB:
             description = article.get('description', '')
             content = article.get('content', description)
             
-            # Generate a stable, reasonably sized ID for the article
-            # Use the last 10 characters of URL hash to avoid massive integers
-            url_hash = str(abs(hash(url)))[-10:] if url else str(abs(hash(title)))[-10:]
-            article_id = int(url_hash)
+            rows.append((stable_article_id(url, title), title, url, source, description, content))
+        
+        if not rows:
+            return []
+        
+        # Insert only articles we haven't stored yet, as one batch with one commit.
+        # The same headlines come back on most fetches, so usually nothing is written.
+        try:
+            with self.read() as cursor:
+                cursor.execute(SQL_EXISTING_ARTICLE_IDS, (json.dumps([row[0] for row in rows]),))
+                existing_ids = {row[0] for row in cursor}
+            new_rows = [row for row in rows if row[0] not in existing_ids]
             
-            # Insert into database with explicit ID
-            try:
-                self.cursor.execute(
-                    """
-                    INSERT OR REPLACE INTO articles 
-                    (id, title, url, source, description, content, published_at) 
-                    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
-                    """,
-                    (article_id, title, url, source, description, content)
-                )
-                
-                added_ids.append(article_id)
-                
-            except Exception as e:
-                print(f"Error inserting article '{title}': {e}")
+            if new_rows:
+                with self.write() as cursor:
+                    cursor.executemany(SQL_INSERT_ARTICLE, new_rows)
+        except Exception as e:
+            print(f"Error inserting articles: {e}")
+            return []
         
-        self.conn.commit()
-        print(f"Added {len(added_ids)} articles to database")
+        added_ids = [row[0] for row in rows]
+        print(f"Added {len(new_rows)} new articles to database ({len(added_ids) - len(new_rows)} already stored)")
         return added_ids
 
+# Video jobs run here instead of on request threads. Each job is a chain of CPU-heavy
+# FFmpeg runs, so only a couple at a time; the rest queue while requests stay responsive.
+video_jobs = ThreadPoolExecutor(max_workers=2, thread_name_prefix="video-job")
+
+# Cap on jobs waiting or running, so a burst of requests can't pile up hours of renders
+MAX_PENDING_VIDEO_JOBS = int(os.environ.get('MAX_PENDING_VIDEO_JOBS', 8))
+_video_job_slots = threading.BoundedSemaphore(MAX_PENDING_VIDEO_JOBS)
+
+VIDEO_QUEUE_FULL = "Too many videos are being generated right now. Please try again in a few minutes."
+
+# Longest a single /api/video_job request may wait for its job to finish, and how often a
+# waiting request re-reads the job row. Each wait holds one of the worker's gthread threads,
+# so gunicorn.conf.py's threads must stay above the number of clients polling at once.
+MAX_VIDEO_JOB_WAIT = 30  # seconds
+VIDEO_JOB_POLL_INTERVAL = 1  # seconds
+
+def set_video_job_status(job_key, status, error=None, **details):
+    """
+    Record the state of a background video job (keyed by script ID or custom-text job ID).
+
+    The state goes to the video_jobs table, so /api/video_status and /api/video_job can
+    tell queued/running/failed jobs apart from unknown ones on every worker.
+    """
+    db.set_video_job(job_key, status, error, details)
+
+def submit_video_job(job_key, job):
+    """
+    Queue a background video job.
+
+    Parameters:
+    - job_key: script ID or custom-text job ID the status is recorded under
+    - job: callable run on the video_jobs pool
+
+    Returns:
+    - bool: False if MAX_PENDING_VIDEO_JOBS jobs are already queued or running
+    """
+    if not _video_job_slots.acquire(blocking=False):
+        return False
+    set_video_job_status(job_key, "queued")
+    video_jobs.submit(job).add_done_callback(lambda _: _video_job_slots.release())
+    return True
+
+def static_video_url(video_path):
+    """URL under /static for a file the VideoCreator wrote below the static directory"""
+    path = Path(video_path)
+    try:
+        return "/static/" + path.resolve().relative_to(STATIC_ROOT).as_posix()
+    except ValueError:
+        return f"/static/{path.name}"
+
 # Initialize DB
 db = SimpleDB("news.db")
+# Request threads open their own connections; don't keep the startup one around, since
+# with preload_app it would be inherited by every forked gunicorn worker
+db.close()
 
 # Initialize GNewsAPI
 try:
@@ -197,28 +467,120 @@ except Exception as e:
     print(f"Error initializing GNewsAPI: {e}")
     news_api = None
 
-# Then initialize the VideoCreator:
-if has_video_creator:
-    try:
-        # Render installs FFmpeg in /usr/bin/ffmpeg, so specify this path directly instead of prompting
-        output_videos_dir = os.path.join(os.getcwd(), 'server', 'static', 'videos')
-        os.makedirs(output_videos_dir, exist_ok=True)
-        
-        # Pass the FFmpeg path explicitly instead of prompting
-        video_creator = VideoCreator(
-            output_dir=output_videos_dir,
-            ffmpeg_path='/usr/bin/ffmpeg'  # Specify this explicitly
-        )
-        has_video_creator = True
-        print(f"VideoCreator initialized with explicit ffmpeg path: /usr/bin/ffmpeg")
-    except Exception as e:
-        print(f"Error initializing VideoCreator: {e}")
-        video_creator = None
-        has_video_creator = False
-        print("VideoCreator not available - video generation will be limited")
+# The VideoCreator is built on the first video request rather than at startup, so
+# workers that only serve news and scripts never pay for its FFmpeg/TTS setup
+video_creator = None
+_video_creator_lock = threading.Lock()
+
+def get_video_creator():
+    """Shared VideoCreator, created on first use (None if it can't be initialized)"""
+    global video_creator, has_video_creator
+    if video_creator is not None or not has_video_creator:
+        return video_creator
+    
+    with _video_creator_lock:
+        if video_creator is None and has_video_creator:
+            try:
+                # Render installs FFmpeg in /usr/bin/ffmpeg, so specify this path directly instead of prompting
+                # Pass the FFmpeg path explicitly instead of prompting
+                video_creator = VideoCreator(
+                    output_dir=static_videos_dir,
+                    ffmpeg_path='/usr/bin/ffmpeg'  # Specify this explicitly
+                )
+                print(f"VideoCreator initialized with explicit ffmpeg path: /usr/bin/ffmpeg")
+            except Exception as e:
+                print(f"Error initializing VideoCreator: {e}")
+                video_creator = None
+                has_video_creator = False
+                print("VideoCreator not available - video generation will be limited")
+    return video_creator
+
+# /api/news_articles is polled by the frontend; serve the last good response for a few
+# minutes instead of spending news API quota and touching the articles table on every call
+NEWS_CACHE_TTL = int(os.environ.get('NEWS_CACHE_TTL', 300))  # seconds
+# "entry" is a (body, etag, parsed payload, projections) tuple, replaced as a whole so readers
+# never see a mismatched set; projections maps (fields, limit) to that narrowed (body, etag)
+_news_cache = {"entry": None, "expires_at": 0.0}
+_news_cache_lock = threading.Lock()
+
+# Distinct ?fields=/?limit= combinations kept per cache entry (the query is client-controlled)
+MAX_NEWS_PROJECTIONS = 16
+
+def _project_news_entry(entry, fields, limit):
+    """
+    Narrow a cached news entry to some article fields and a number of articles.
+
+    Parameters:
+    - entry: cached (body, etag, payload, projections) tuple
+    - fields: article keys to keep, or empty for all of them
+    - limit: number of articles to keep, or 0 for all of them
+
+    Returns:
+    - tuple: (body, etag) of the narrowed response
+    """
+    payload = entry[2]
+    articles = payload["data"]["articles"]
+    if limit > 0:
+        articles = articles[:limit]
+    if fields:
+        articles = [{key: article[key] for key in fields if key in article} for article in articles]
+    data = dict(payload["data"], articles=articles)
+    body = ojson(dict(payload, data=data)).get_data()
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def _cached_news_response(entry):
+    """
+    Response for a cached news entry, or 304 when the client already has that body.
+
+    ?fields=id,title keeps only those article keys and ?limit=N only the first N articles,
+    so a client that needs one ID doesn't download every description. Each narrowed body
+    is built once per entry and then served as stored bytes like the full one.
+    """
+    body, etag, _, projections = entry
+    fields = tuple(field for field in request.args.get('fields', '').split(',') if field)
+    limit = max(request.args.get('limit', 0, type=int), 0)
+    if fields or limit:
+        projected = projections.get((fields, limit))
+        if projected is None:
+            projected = _project_news_entry(entry, fields, limit)
+            if len(projections) < MAX_NEWS_PROJECTIONS:
+                projections[(fields, limit)] = projected
+        body, etag = projected
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, max-age=60'
+    return response
 
 @app.route('/api/news_articles', methods=['GET'])
 def get_news_articles():
+    entry = _news_cache["entry"]
+    if entry is not None and time.time() < _news_cache["expires_at"]:
+        return _cached_news_response(entry)
+    
+    # Only one thread refreshes; the others wait and then get the fresh copy
+    with _news_cache_lock:
+        entry = _news_cache["entry"]
+        if entry is not None and time.time() < _news_cache["expires_at"]:
+            return _cached_news_response(entry)
+        
+        response = app.make_response(_fetch_news_articles())
+        payload = response.get_json(silent=True) or {}
+        if response.status_code == 200 and payload.get("success"):
+            body = response.get_data()
+            entry = (body, hashlib.blake2b(body, digest_size=16).hexdigest(), payload, {})
+            _news_cache["entry"] = entry
+            _news_cache["expires_at"] = time.time() + NEWS_CACHE_TTL
+            return _cached_news_response(entry)
+        elif entry is not None:
+            # Serve the stale copy rather than an error
+            print("News fetch failed, serving cached articles")
+            return _cached_news_response(entry)
+        return response
+
+def _fetch_news_articles():
     try:
         if news_api is not None:
             # Use the same approach as in the CLI version
@@ -261,27 +623,22 @@ def get_news_articles():
                     print(f"Error storing articles in database: {e}")
                     article_ids = []
                 
-                for i, (_, article) in enumerate(articles_df.iterrows()):
-                    url = article.get('url', '')
-                    title = article.get('title', 'No Title')
-                    
-                    # Generate a consistent ID the same way we do when storing in DB
-                    url_hash = str(abs(hash(url)))[-10:] if url else str(abs(hash(title)))[-10:]
-                    article_id = int(url_hash)
-                    
-                    # Use the generated ID or database-assigned ID
-                    id_to_use = article_ids[i] if i < len(article_ids) else article_id
-                    
+                records = articles_df.to_dict('records')
+                if len(article_ids) != len(records):
+                    # Storing failed; the IDs are deterministic, so derive the same ones here
+                    article_ids = [stable_article_id(a.get('url', ''), a.get('title', 'No Title')) for a in records]
+                
+                for article_id, article in zip(article_ids, records):
                     articles.append({
-                        "id": id_to_use,
-                        "title": title,
+                        "id": article_id,
+                        "title": article.get('title', 'No Title'),
                         "description": article.get('description', 'No description available'),
                         "source": article.get('source', 'Unknown Source')
                     })
                 
                 source_info = "GNewsAPI (Live)"
                 print(f"Returning {len(articles)} articles from GNewsAPI")
-                return jsonify({
+                return ojson({
                     "success": True,
                     "data": {
                         "articles": articles,
@@ -292,28 +649,18 @@ def get_news_articles():
         
         # Fallback to database if GNewsAPI isn't available or returned no results
         print("GNewsAPI not available or returned no results, falling back to database...")
-        unused_articles = db.get_unused_articles(limit=8)
+        articles = db.get_unused_articles(limit=8)
         
-        if not unused_articles:
-            return jsonify({
+        if not articles:
+            return ojson({
                 "success": False, 
                 "error": "No articles available. Please try again later."
             })
         
-        # Format articles from the database
-        articles = []
-        for article_id, title, description, source in unused_articles:
-            articles.append({
-                "id": article_id,
-                "title": title,
-                "description": description,
-                "source": source
-            })
-        
         source_info = "Database (SimpleDB)"
         print(f"Returning {len(articles)} articles from database")
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
                 "articles": articles,
@@ -323,8 +670,11 @@ def get_news_articles():
         })
         
     except Exception as e:
-        traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
+        app.logger.exception("Error fetching news articles")
+        return ojson({"success": False, "error": str(e)}), 500
+
+# How long a generated script is handed out again for the same article
+SCRIPT_REUSE_SECONDS = int(os.environ.get('SCRIPT_REUSE_SECONDS', 3600))
 
 @app.route('/api/generate_script', methods=['POST'])
 def generate_script():
@@ -333,56 +683,69 @@ def generate_script():
         article_id = data.get('article_id')
         
         if not article_id:
-            return jsonify({"success": False, "error": "No article_id provided"}), 400
+            return ojson({"success": False, "error": "No article_id provided"}), 400
         
         # Convert to integer if needed
         try:
             article_id = int(article_id)
         except (ValueError, TypeError):
-            return jsonify({"success": False, "error": f"Invalid article ID format: {article_id}"}), 400
+            return ojson({"success": False, "error": f"Invalid article ID format: {article_id}"}), 400
             
         # Debug info
         print(f"Generating script for article ID: {article_id}")
         
         # Get article details
-        db.cursor.execute(
-            "SELECT id, title, description FROM articles WHERE id = ?", 
-            (article_id,)
-        )
-        article = db.cursor.fetchone()
+        with db.read() as cursor:
+            article = cursor.execute(SQL_GET_ARTICLE, (article_id,)).fetchone()
         
         if not article:
             # Try to debug
-            db.cursor.execute("SELECT id FROM articles")
-            available_ids = [row[0] for row in db.cursor.fetchall()]
+            with db.read() as cursor:
+                available_ids = [row[0] for row in cursor.execute(SQL_ALL_ARTICLE_IDS)]
             print(f"Available article IDs: {available_ids}")
             
-            return jsonify({
+            return ojson({
                 "success": False, 
                 "error": f"Article with ID {article_id} not found"
             }), 404
             
-        # Generate script using the same function as in CLI
-        script = script_generator.generate_script(article['title'], article['description'])
+        # SQL_GET_ARTICLE selects id, title, description
+        _, title, description = article
+        
+        # Reuse a script written for this article recently instead of paying for
+        # another LLM call; the client can ask for a fresh one with "regenerate"
+        recent_script = None
+        if not data.get('regenerate'):
+            with db.read() as cursor:
+                recent_script = cursor.execute(
+                    SQL_RECENT_SCRIPT_FOR_ARTICLE, (article_id, f"-{SCRIPT_REUSE_SECONDS} seconds")
+                ).fetchone()
         
-        # Save script to database
-        script_id = db.add_script(article_id, script)
-        db.mark_article_as_used(article_id)
+        if recent_script:
+            script_id, script = recent_script
+            print(f"Reusing script {script_id} for article ID: {article_id}")
+        else:
+            # Generate script using the same function as in CLI
+            script = script_generator.generate_script(title, description)
+            
+            # Save script to database
+            script_id = db.add_script(article_id, script)
+            db.mark_article_as_used(article_id)
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
                 "script_id": script_id,
                 "article_id": article_id,
-                "title": article['title'],
+                "title": title,
                 "script": script
             },
             "error": None
         })
         
     except Exception as e:
-        traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
+        app.logger.exception("Error in generate_script")
+        return ojson({"success": False, "error": str(e)}), 500
 
 @app.route('/api/generate_video_from_article', methods=['POST'])
 def generate_video_from_article():
@@ -392,45 +755,38 @@ def generate_video_from_article():
         script_id = data.get('script_id')
         
         if not script_id:
-            return jsonify({"success": False, "error": "No script_id provided"}), 400
+            return ojson({"success": False, "error": "No script_id provided"}), 400
         
         # Debug info
         print(f"Starting video generation for script ID: {script_id}")
         
         # Get script from database
-        db.cursor.execute(
-            """
-            SELECT s.id, s.script_text, a.title 
-            FROM scripts s
-            JOIN articles a ON s.article_id = a.id
-            WHERE s.id = ?
-            """, 
-            (script_id,)
-        )
-        script_data = db.cursor.fetchone()
+        with db.read() as cursor:
+            script_data = cursor.execute(SQL_GET_SCRIPT_WITH_TITLE, (script_id,)).fetchone()
         
         if not script_data:
-            return jsonify({"success": False, "error": f"Script with ID {script_id} not found"}), 404
-            
-        # Create a unique video filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        video_filename = f"video_{script_id}_{timestamp}.mp4"
-        videos_dir = os.path.join(os.getcwd(), 'server', 'static', 'videos')
-        video_path = os.path.join(videos_dir, video_filename)
+            return ojson({"success": False, "error": f"Script with ID {script_id} not found"}), 404
         
+        # SQL_GET_SCRIPT_WITH_TITLE selects id, script_text, title
+        _, script_text, title = script_data
+            
         # Start video generation in background thread
         def generate_video_in_background():
             try:
-                print(f"[BG THREAD] Starting video generation for: {script_data['title']}")
-                print(f"[BG THREAD] Using script with {len(script_data['script_text'])} characters")
+                set_video_job_status(script_id, "processing")
+                print(f"[BG THREAD] Starting video generation for: {title}")
+                print(f"[BG THREAD] Using script with {len(script_text)} characters")
                 
                 # ... existing monitoring code ...
                 
+                creator = get_video_creator()
+                if creator is None:
+                    print("[BG THREAD] VideoCreator not available, skipping video generation")
+                    set_video_job_status(script_id, "failed", "Video generation is not available")
+                    return
+                
                 # This is the line that gets the result
-                video_result = video_creator.create_video_from_text(
-                    script_data['title'], 
-                    script_data['script_text']
-                )
+                video_result = creator.create_video_from_text(title, script_text)
                 
                 print(f"[BG THREAD] Video generation completed: {video_result}")
                 
@@ -442,34 +798,44 @@ def generate_video_from_article():
                 
                 # Save to database if successful
                 if video_path:
-                    db.cursor.execute(
-                        "INSERT INTO videos (script_id, video_path, created_at) VALUES (?, ?, datetime('now'))",
-                        (script_id, video_path)
-                    )
-                    db.conn.commit()
+                    db.add_video(script_id, video_path)
                     print(f"[BG THREAD] Video saved to database: {video_path}")
+                    set_video_job_status(script_id, "completed")
+                else:
+                    set_video_job_status(script_id, "failed", "Video creation failed")
                 
             except Exception as e:
-                print(f"[BG THREAD] Error creating video: {e}")
-                traceback.print_exc()
+                app.logger.exception("[BG THREAD] Error creating video")
+                set_video_job_status(script_id, "failed", str(e))
                 
-        thread = threading.Thread(target=generate_video_in_background)
-        thread.daemon = True
-        thread.start()
+        if not submit_video_job(script_id, generate_video_in_background):
+            return ojson({"success": False, "error": VIDEO_QUEUE_FULL}), 429
         
-        # Return immediate response
-        return jsonify({
+        # Accepted: the client polls /api/video_status/<script_id> for the result
+        return ojson({
             "success": True,
             "data": {
+                "job_id": script_id,
                 "status": "processing",
+                "status_url": f"/api/video_status/{script_id}",
                 "message": "Video generation started"
-            }
-        })
+            },
+            "error": None
+        }), 202
         
     except Exception as e:
-        print(f"Error in generate_video_from_article: {e}")
-        traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
+        app.logger.exception("Error in generate_video_from_article")
+        return ojson({"success": False, "error": str(e)}), 500
+
+_TEXT_VIDEO_FONT = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+
+@functools.lru_cache(maxsize=1)
+def _text_video_font_option():
+    """drawtext fontfile option for text videos, resolved once ("" lets fontconfig choose)"""
+    if os.path.isfile(_TEXT_VIDEO_FONT):
+        return f"fontfile='{_TEXT_VIDEO_FONT}':"
+    fonts = _list_ttf_fonts()
+    return f"fontfile='{fonts[0]}':" if fonts else ""
 
 def create_text_video(title, text, output_path):
     """Create a very simple video with text using ffmpeg"""
@@ -478,15 +844,19 @@ def create_text_video(title, text, output_path):
         
         # Create temp directory
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Generate a basic image with text
-            image_path = os.path.join(temp_dir, "text.png")
+            # drawtext reads the text from a file, so quotes, colons and backslashes in
+            # user input can't break out of (or inject into) the filter graph
+            text_path = os.path.join(temp_dir, "text.txt")
+            with open(text_path, "w", encoding="utf-8") as f:
+                f.write(f"{title}\n\n{text}")
             
             # Use ffmpeg to create image with text
             text_cmd = [
                 'ffmpeg', '-y',
                 '-f', 'lavfi',
-                '-i', f'color=c=black:s=1280x720:d=10',
-                '-vf', f'drawtext=fontfile=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf:text={title}\\n\\n{text}:fontcolor=white:fontsize=24:x=(w-text_w)/2:y=(h-text_h)/2:line_spacing=10',
+                '-i', 'color=c=black:s=1280x720:d=10',
+                '-vf', (f"drawtext={_text_video_font_option()}textfile='{text_path}':expansion=none:"
+                        "fontcolor=white:fontsize=24:x=(w-text_w)/2:y=(h-text_h)/2:line_spacing=10"),
                 '-t', '10',
                 output_path
             ]
@@ -496,54 +866,42 @@ def create_text_video(title, text, output_path):
             return output_path
             
     except Exception as e:
-        print(f"Error creating text video: {e}")
-        traceback.print_exc()
+        app.logger.exception("Error creating text video")
         return None
 
 @app.route('/api/videos', methods=['GET'])
 def get_videos():
     try:
         # Get all videos ordered by created_at descending (newest first)
-        db.cursor.execute("""
-            SELECT v.id, v.script_id, v.video_path, v.created_at, 
-                   s.article_id, a.title
-            FROM videos v
-            JOIN scripts s ON v.script_id = s.id
-            JOIN articles a ON s.article_id = a.id
-            ORDER BY v.created_at DESC
-            LIMIT 50
-        """)
-        
-        videos_raw = db.cursor.fetchall()
-        
-        videos = []
-        for video in videos_raw:
-            videos.append({
-                "id": video[0],
-                "script_id": video[1],
-                "video_url": f"/static/{video[2]}" if not video[2].startswith('/static/') else video[2],
-                "created_at": video[3],
-                "article_id": video[4],
-                "title": video[5]
-            })
+        # SQL_RECENT_VIDEOS already maps video_path to the /static URL
+        with db.read() as cursor:
+            count, max_id = cursor.execute(SQL_VIDEOS_VERSION).fetchone()
+            etag = f"videos-{count}-{max_id}"
+            # The frontend polls this list; skip the join and the encode if it hasn't changed
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = ojson({
+                    "success": True,
+                    "data": {
+                        "videos": [dict(row) for row in cursor.execute(SQL_RECENT_VIDEOS)]
+                    },
+                    "error": None
+                })
         
-        return jsonify({
-            "success": True,
-            "data": {
-                "videos": videos
-            },
-            "error": None
-        })
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, max-age=2'
+        return response
         
     except Exception as e:
-        traceback.print_exc()
-        return jsonify({"success": False, "error": str(e)}), 500
+        app.logger.exception("Error in get_videos")
+        return ojson({"success": False, "error": str(e)}), 500
 
 @app.route('/api/generate_video_from_custom_text', methods=['POST'])
 def generate_video_from_custom_text():
     try:
         # Check if video_creator is available
-        if not has_video_creator or video_creator is None:
+        if get_video_creator() is None:
             print("VideoCreator not available. Creating placeholder text-to-video.")
             
             # Create a placeholder response
@@ -551,15 +909,11 @@ def generate_video_from_custom_text():
             title = data.get('title', 'Untitled')
             text_content = data.get('text', '')
             
-            # Fix: Use a different variable n
-            current_time = datetime.now()
-            timestamp = current_time.strftime('%Y%m%d_%H%M%S')
-            video_filename = f"custom_video_{timestamp}.mp4"
+            # Nanosecond stamp: two requests in the same second must not share a file
+            video_filename = f"custom_video_{time.time_ns()}.mp4"
             
             # Create placeholder file
-            videos_dir = os.path.join(app.static_folder, 'videos')
-            os.makedirs(videos_dir, exist_ok=True)
-            placeholder_path = os.path.join(videos_dir, video_filename)
+            placeholder_path = os.path.join(static_videos_dir, video_filename)
             
             with open(placeholder_path, 'wb') as f:
                 f.write(b'placeholder')
@@ -569,21 +923,9 @@ def generate_video_from_custom_text():
             video_url = f"/static/videos/{os.path.basename(placeholder_path)}"
             
             # FIX: Save to database using only columns that actually exist
-            db.cursor.execute(
-                """
-                INSERT INTO videos 
-                (script_id, video_path, created_at) 
-                VALUES (?, ?, datetime('now'))
-                """,
-                (
-                    0,  # Use 0 as a placeholder for script_id
-                    placeholder_path
-                )
-            )
-            db.conn.commit()
-            video_id = db.cursor.lastrowid  # Get the auto-generated ID
+            video_id = db.add_video(0, placeholder_path)  # 0 as a placeholder for script_id
             
-            return jsonify({
+            return ojson({
                 "success": True,
                 "data": {
                     "video_id": video_id,
@@ -595,36 +937,107 @@ def generate_video_from_custom_text():
                 "error": None
             })
         
-        # Rest of your code for the case when video_creator is available...
+        data = request.json or {}
+        title = data.get('title', 'Untitled')
+        text_content = data.get('text', '')
+        if not text_content.strip():
+            return ojson({"success": False, "data": None, "error": "No text provided"}), 400
+        
+        # Render in the background and let the client poll /api/video_job/<job_id>
+        job_id = uuid.uuid4().hex
+        
+        def generate_custom_video_in_background():
+            try:
+                set_video_job_status(job_id, "processing")
+                result = get_video_creator().create_video_from_text(title, text_content)
+                video_path = result[0] if isinstance(result, tuple) else result
+                vertical_path = result[2] if isinstance(result, tuple) and len(result) > 2 else None
+                
+                if not video_path:
+                    error = result[1] if isinstance(result, tuple) and len(result) > 1 else None
+                    set_video_job_status(job_id, "failed", error or "Video creation failed")
+                    return
+                
+                video_id = db.add_video(0, video_path)  # 0: no script for custom text
+                set_video_job_status(
+                    job_id, "completed",
+                    video_id=video_id,
+                    title=title,
+                    video_url=static_video_url(video_path),
+                    vertical_video_url=static_video_url(vertical_path) if vertical_path else None
+                )
+            except Exception as e:
+                app.logger.exception("[BG THREAD] Error creating custom text video")
+                set_video_job_status(job_id, "failed", str(e))
+        
+        if not submit_video_job(job_id, generate_custom_video_in_background):
+            return ojson({"success": False, "data": None, "error": VIDEO_QUEUE_FULL}), 429
+        
+        return ojson({
+            "success": True,
+            "data": {
+                "job_id": job_id,
+                "status": "queued",
+                "message": "Video generation started"
+            },
+            "error": None
+        }), 202
         
     except Exception as e:
-        traceback.print_exc()
-        return jsonify({
+        app.logger.exception("Error in generate_video_from_custom_text")
+        return ojson({
             "success": False,
             "data": None,
             "error": str(e)
         }), 500
 
+@app.route('/api/video_job/<job_id>', methods=['GET'])
+def get_video_job(job_id):
+    """
+    Status of a custom-text video job started by /api/generate_video_from_custom_text.
+
+    With ?wait=N the request is held for up to N seconds (capped at MAX_VIDEO_JOB_WAIT)
+    and answered within VIDEO_JOB_POLL_INTERVAL of the job completing or failing.
+    """
+    wait = min(request.args.get('wait', 0, type=float), MAX_VIDEO_JOB_WAIT)
+    deadline = time.monotonic() + wait
+    job = db.get_video_job(job_id)
+    while job is not None and job["status"] in ("queued", "processing"):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(VIDEO_JOB_POLL_INTERVAL, remaining))
+        job = db.get_video_job(job_id)
+    if job is None:
+        return ojson({"success": False, "data": None, "error": "Unknown job ID"}), 404
+    return ojson({"success": True, "data": dict(job, job_id=job_id), "error": None})
+
 @app.route('/test')
 def test_page():
     return render_template('test.html')
 
 @app.route('/api/health', methods=['GET', 'HEAD'])
 def health_check():
-    return jsonify({"status": "ok", "message": "Server is running"}), 200
+    return ojson({"status": "ok", "message": "Server is running"}), 200
+
+# Rendered videos get a new timestamped name each time, so clients can keep them for a day.
+# send_from_directory already hands the file to the server's wsgi.file_wrapper (sendfile under
+# gunicorn) and answers Range / If-Modified-Since; set USE_X_SENDFILE behind a proxy that
+# serves the file itself.
+STATIC_FILE_MAX_AGE = 86400  # seconds
+app.use_x_sendfile = bool(os.environ.get('USE_X_SENDFILE'))
 
 @app.route('/videos/<path:filename>')
 def serve_video(filename):
-    video_path = os.path.join(os.path.dirname(__file__), 'static', 'videos')
-    return send_from_directory(video_path, filename)
+    return send_from_directory(static_videos_dir, filename, max_age=STATIC_FILE_MAX_AGE)
 
 @app.route('/static/<path:path>')
 def serve_static(path):
-    return send_from_directory('static', path)
+    return send_from_directory(static_dir, path, max_age=STATIC_FILE_MAX_AGE)
 
 @app.route('/')
 def index():
-    return jsonify({
+    return ojson({
         "status": "ok",
         "message": "API is running. Use /api/... endpoints to access functionality.",
         "version": "1.0.0",
@@ -636,33 +1049,39 @@ def get_video_status(script_id):
     """Check if a video has been generated for a script"""
     try:
         # Look for video in database
-        db.cursor.execute(
-            "SELECT id, video_path, created_at FROM videos WHERE script_id = ? ORDER BY created_at DESC LIMIT 1", 
-            (script_id,)
-        )
-        
-        video = db.cursor.fetchone()
+        with db.read() as cursor:
+            video = cursor.execute(SQL_LATEST_VIDEO_FOR_SCRIPT, (script_id,)).fetchone()
         
         if video:
-            video_path = video['video_path']
-            # Check if file exists and has content
-            full_path = os.path.join(os.getcwd(), 'server', video_path.lstrip('/')) if video_path.startswith('/') else video_path
-            
-            if os.path.exists(full_path) and os.path.getsize(full_path) > 1000:  # Real video should be > 1KB
+            # SQL_LATEST_VIDEO_FOR_SCRIPT selects id, video_path, created_at
+            video_id, video_path, created_at = video
+            # The VideoCreator stores absolute paths; older rows may hold /static/... URLs
+            # or paths relative to the app directory
+            if os.path.isabs(video_path) and not video_path.startswith('/static/'):
+                full_path = video_path
+            else:
+                full_path = os.path.join(app_root, video_path.lstrip('/'))
+            # Check if file exists and has content (one stat, so every worker agrees)
+            try:
+                ready = os.stat(full_path).st_size > 1000  # Real video should be > 1KB
+            except OSError:
+                ready = False
+
+            if ready:
                 # Video is ready
-                return jsonify({
+                return ojson({
                     "success": True,
                     "data": {
                         "status": "completed",
-                        "video_id": video['id'],
-                        "video_url": f"/static/{os.path.basename(video_path)}" if not video_path.startswith('/static/') else video_path,
-                        "created_at": video['created_at']
+                        "video_id": video_id,
+                        "video_url": static_video_url(full_path),
+                        "created_at": created_at
                     },
                     "error": None
                 })
             else:
                 # Video is a placeholder or still processing
-                return jsonify({
+                return ojson({
                     "success": True,
                     "data": {
                         "status": "processing",
@@ -671,8 +1090,29 @@ def get_video_status(script_id):
                     "error": None
                 })
         else:
+            job = db.get_video_job(script_id)
+            if job and job["status"] in ("queued", "processing"):
+                return ojson({
+                    "success": True,
+                    "data": {
+                        "status": "processing",
+                        "message": "Video is queued for generation." if job["status"] == "queued"
+                                   else "Video is still being generated. Please check again in a minute."
+                    },
+                    "error": None
+                })
+            if job and job["status"] == "failed":
+                return ojson({
+                    "success": True,
+                    "data": {
+                        "status": "failed",
+                        "message": job["error"] or "Video generation failed."
+                    },
+                    "error": None
+                })
+            
             # No video found
-            return jsonify({
+            return ojson({
                 "success": True,
                 "data": {
                     "status": "not_found",
@@ -683,56 +1123,86 @@ def get_video_status(script_id):
             
     except Exception as e:
         print(f"Error checking video status: {e}")
-        return jsonify({"success": False, "error": str(e)}), 500
+        return ojson({"success": False, "error": str(e)}), 500
+
+_FONT_DIRS = ('/usr/share/fonts', '/usr/local/share/fonts', os.path.expanduser('~/.fonts'))
+
+@functools.lru_cache(maxsize=1)
+def _list_ttf_fonts():
+    """
+    TrueType font files installed on the system, looked up once per process.
+
+    Asks fontconfig's cache (fc-list) instead of walking the whole filesystem, and
+    falls back to scanning the usual font directories when fc-list isn't installed.
+
+    Returns:
+    - tuple of font file paths
+    """
+    try:
+        result = subprocess.run(['fc-list', '--format', '%{file}\n'],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        paths = result.stdout.decode('utf-8').splitlines()
+    except (OSError, subprocess.CalledProcessError):
+        paths = [os.path.join(root, name)
+                 for font_dir in _FONT_DIRS
+                 for root, _, files in os.walk(font_dir)
+                 for name in files]
+    return tuple(sorted({p for p in paths if p.lower().endswith('.ttf')}))
 
 @app.route('/api/debug/fonts', methods=['GET'])
 def debug_fonts():
     """List available fonts on the system"""
     try:
-        result = subprocess.run(['find', '/', '-name', '*.ttf', '-o', '-name', '*.TTF'], 
-                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        fonts = result.stdout.decode('utf-8').split('\n')
-        return jsonify({"available_fonts": fonts})
+        return ojson({"available_fonts": list(_list_ttf_fonts())})
     except Exception as e:
-        return jsonify({"error": str(e)})
+        return ojson({"error": str(e)})
 
 @app.route('/api/create_test_video', methods=['GET'])
 def create_test_video():
     """Create a test video to verify ffmpeg works"""
     try:
-        output_dir = os.path.join(os.getcwd(), 'server', 'static', 'videos')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        output_path = os.path.join(output_dir, f"test_video_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4")
+        output_path = os.path.join(static_videos_dir, f"test_video_{time.time_ns()}.mp4")
         
-        # Super simple command to generate a 5-second video
+        # Super simple command to generate a 5-second video. This runs on the request
+        # thread, so keep it as cheap as possible: a flat colour at a low frame rate with
+        # the fastest x264 preset, and a timeout so a stuck FFmpeg can't hold the worker.
         cmd = [
-            'ffmpeg', '-y',
+            'ffmpeg', '-y', '-loglevel', 'error',
             '-f', 'lavfi',
-            '-i', 'color=c=blue:s=640x360:d=5',
+            '-i', 'color=c=blue:s=640x360:d=5:r=10',
             '-c:v', 'libx264',
+            '-preset', 'ultrafast',
             '-pix_fmt', 'yuv420p',
             output_path
         ]
         
-        result = subprocess.run(cmd, capture_output=True)
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=60)
+        except subprocess.TimeoutExpired:
+            return ojson({"success": False, "error": "Timed out creating test video"})
         
         if result.returncode == 0:
             video_url = f"/static/videos/{os.path.basename(output_path)}"
-            return jsonify({
+            return ojson({
                 "success": True, 
                 "message": "Test video created", 
                 "video_url": video_url
             })
         else:
-            return jsonify({
+            return ojson({
                 "success": False, 
                 "error": f"Failed to create test video: {result.stderr.decode('utf-8')}"
             })
             
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)})
+        return ojson({"success": False, "error": str(e)})
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    try:
+        # Use a production WSGI server when one is installed (gunicorn is used on Render)
+        from waitress import serve
+        print(f"Serving with waitress on port {port}")
+        serve(app, host='0.0.0.0', port=port, threads=8)
+    except ImportError:
+        app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
\ No newline at end of file
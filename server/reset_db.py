@@ -1,9 +1,9 @@
 # reset_db.py - Quick script to reset the database for testing
-import requests
+from test_api import make_session, TIMEOUT
 
 def reset_database():
     print("Resetting database...")
-    response = requests.post("http://localhost:5000/api/reset_database")
+    response = make_session().post("http://localhost:5000/api/reset_database", timeout=TIMEOUT)
     if response.status_code == 200:
         print("Success! Database reset.")
         print(response.json())
@@ -1,17 +1,75 @@
 # server/test_api.py
+import argparse
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    has_orjson = True
+except ImportError:
+    has_orjson = False
 
 BASE_URL = "http://localhost:5000/api"
 
+# Full response bodies are only printed when VERBOSE is set in the environment
+VERBOSE = bool(os.environ.get("VERBOSE"))
+
+# (connect, read) timeouts for every call; the read side covers a slow script generation
+TIMEOUT = (3.05, 300)
+
+def make_session():
+    """
+    Keep-alive session that retries GETs on connection errors and 502/503/504 with backoff.
+
+    POSTs are not retried: generate_script and the video endpoints would run the OpenAI
+    call or queue the video a second time.
+    """
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                  allowed_methods=("GET",))
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
+    return session
+
+# One keep-alive session for the whole run, so each call reuses the same connection
+SESSION = make_session()
+
+def parse_json(response):
+    """Decode a response body, with orjson when it is installed"""
+    return orjson.loads(response.content) if has_orjson else response.json()
+
+def dump_json(obj):
+    """Encode a request body to bytes, with orjson when it is installed"""
+    return orjson.dumps(obj) if has_orjson else json.dumps(obj).encode()
+
+def pretty_json(result):
+    """Indented JSON text for printing a result"""
+    if has_orjson:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(result, indent=2)
+
+def show_result(result, id_key=None):
+    """Print the success flag and id_key from the data, plus the whole body when VERBOSE is set"""
+    print(f"Success: {result.get('success')}")
+    if id_key:
+        print(f"{id_key}: {(result.get('data') or {}).get(id_key)}")
+    if VERBOSE:
+        print(pretty_json(result))
+
 def test_get_articles():
     print("Testing get_news_articles endpoint to fetch unused articles...")
-    response = requests.get(f"{BASE_URL}/news_articles")
-    result = response.json()
+    # Only the first article's ID is used, so ask for just that
+    response = SESSION.get(
+        f"{BASE_URL}/news_articles",
+        params={"fields": "id", "limit": 1},
+        timeout=TIMEOUT
+    )
+    result = parse_json(response)
     print(f"Status Code: {response.status_code}")
-    print(f"Found {len(result.get('data', {}).get('articles', []))} unused articles")
-    print(json.dumps(result, indent=2))
+    show_result(result)
     
     if result.get("success"):
         articles = result.get("data", {}).get("articles", [])
@@ -25,48 +83,75 @@ def test_generate_script(article_id):
         return None
         
     print(f"\nTesting generate_script with article_id {article_id}...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/generate_script", 
-        json={"article_id": article_id}
+        json={"article_id": article_id},
+        timeout=TIMEOUT
     )
-    result = response.json()
+    result = parse_json(response)
     print(f"Status Code: {response.status_code}")
-    print(json.dumps(result, indent=2))
+    show_result(result, "script_id")
     
     if result.get("success"):
         return result.get("data", {}).get("script_id")
     return None
 
+def test_generate_script_without_article():
+    # The server has no default article, so this should come back as a 400
+    print("\nTesting generate_script without an article_id...")
+    response = SESSION.post(f"{BASE_URL}/generate_script", json={}, timeout=TIMEOUT)
+    result = parse_json(response)
+    print(f"Status Code: {response.status_code}")
+    show_result(result)
+
 def test_generate_video_from_article(script_id):
     if not script_id:
         print("No script_id available, skipping video generation test")
         return
         
     print(f"\nTesting generate_video_from_article with script_id {script_id}...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/generate_video_from_article", 
-        json={"script_id": script_id}
+        json={"script_id": script_id},
+        timeout=TIMEOUT
     )
-    result = response.json()
+    result = parse_json(response)
     print(f"Status Code: {response.status_code}")
-    print(json.dumps(result, indent=2))
+    show_result(result, "job_id")
+
+# The custom text request never changes, so encode its body once at import time
+CUSTOM_TEXT_BODY = dump_json({
+    "title": "Test Custom Video", 
+    "text": "This is a sample text to test the custom text to video API endpoint. It should generate a short video with narration."
+})
+JSON_HEADERS = {"Content-Type": "application/json"}
 
-def test_generate_video_from_custom_text():
+def test_generate_video_from_custom_text(wait=0):
     print("\nTesting generate_video_from_custom_text...")
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/generate_video_from_custom_text", 
-        json={
-            "title": "Test Custom Video", 
-            "text": "This is a sample text to test the custom text to video API endpoint. It should generate a short video with narration."
-        }
+        data=CUSTOM_TEXT_BODY,
+        headers=JSON_HEADERS,
+        timeout=TIMEOUT
     )
-    result = response.json()
+    result = parse_json(response)
     print(f"Status Code: {response.status_code}")
-    print(json.dumps(result, indent=2))
-
-if __name__ == "__main__":
-    print("Starting API tests...")
+    show_result(result, "job_id")
     
+    job_id = (result.get("data") or {}).get("job_id")
+    if wait and job_id:
+        # One long-poll request: the server answers as soon as the job finishes
+        print(f"\nWaiting up to {wait}s for custom text job {job_id}...")
+        response = SESSION.get(
+            f"{BASE_URL}/video_job/{job_id}",
+            params={"wait": wait},
+            timeout=(TIMEOUT[0], wait + 5)
+        )
+        result = parse_json(response)
+        print(f"Status Code: {response.status_code}")
+        print(f"Job status: {(result.get('data') or {}).get('status')}")
+
+def test_article_pipeline():
     # Test getting articles
     article_id = test_get_articles()
     
@@ -74,12 +159,28 @@ if __name__ == "__main__":
     if article_id:
         script_id = test_generate_script(article_id)
         
-        # Test video generation from article
+        # Test video generation from article (the script row is committed before
+        # generate_script responds, so there is nothing to wait for)
         if script_id:
-            time.sleep(2)  # Give some time for the server to process
             test_generate_video_from_article(script_id)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exercise the API of a running server")
+    parser.add_argument("--no-article", action="store_true",
+                        help="also check that generate_script rejects a request without an article_id")
+    parser.add_argument("--wait", type=int, default=0, metavar="SECONDS",
+                        help="wait up to SECONDS (max 30) for the custom text video to finish")
+    args = parser.parse_args()
+    
+    print("Starting API tests...")
+    
+    # The custom text test doesn't depend on the article chain, so run it alongside
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        custom_text_test = executor.submit(test_generate_video_from_custom_text, args.wait)
+        test_article_pipeline()
+        custom_text_test.result()
     
-    # Test custom text to video
-    test_generate_video_from_custom_text()
+    if args.no_article:
+        test_generate_script_without_article()
     
     print("\nTests completed!")
\ No newline at end of file
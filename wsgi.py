@@ -1,16 +1,15 @@
 import sys
 import os
 
-# Add the server directory to the path
-sys.path.insert(0, os.path.abspath("./server"))
+# Add the server directory to the path, relative to this file rather than the working
+# directory; app.py imports its sibling AutoVid as a top-level module, so the server
+# directory has to be on the path rather than imported as a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "server"))
 
 from app import app
 
-# This timeout configuration will be used by Render
-# Increase the timeout to 5 minutes (300 seconds)
-timeout = 300
-workers = 2
-threads = 2
+# Gunicorn never reads settings from this module; workers, threads and timeouts
+# live in gunicorn.conf.py, which the Procfile passes with --config
 
 if __name__ == "__main__":
     app.run() 
\ No newline at end of file